@@ -0,0 +1,37 @@
+"""add composite listing index to sms_logs
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect
+
+revision: str = "d0e1f2a3b4c5"
+down_revision: Union[str, None] = "c9d0e1f2a3b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = "ix_sms_logs_created_process_status"
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if not inspect(conn).has_table("sms_logs"):
+        return
+    indexes = {i["name"] for i in inspect(conn).get_indexes("sms_logs")}
+    if INDEX_NAME not in indexes:
+        # Serves /api/sms/logs: ORDER BY created_at DESC with process_name/status filters
+        op.create_index(INDEX_NAME, "sms_logs", ["created_at", "process_name", "status"])
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if not inspect(conn).has_table("sms_logs"):
+        return
+    indexes = {i["name"] for i in inspect(conn).get_indexes("sms_logs")}
+    if INDEX_NAME in indexes:
+        op.drop_index(INDEX_NAME, table_name="sms_logs")
@@ -0,0 +1,45 @@
+"""add sms_logs_daily rollup table
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision: str = "e1f2a3b4c5d6"
+down_revision: Union[str, None] = "d0e1f2a3b4c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if inspect(conn).has_table("sms_logs_daily"):
+        return
+    op.create_table(
+        "sms_logs_daily",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("process_name", sa.String(100), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("log_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("sms_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("day", "process_name", "status"),
+    )
+    if inspect(conn).has_table("sms_logs"):
+        # Backfill from existing logs; new rows are added by the SMS audit writer
+        op.execute(
+            "INSERT INTO sms_logs_daily (day, process_name, status, log_count, sms_count) "
+            "SELECT DATE(created_at), process_name, status, COUNT(*), COALESCE(SUM(sms_count), 0) "
+            "FROM sms_logs GROUP BY DATE(created_at), process_name, status"
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if inspect(conn).has_table("sms_logs_daily"):
+        op.drop_table("sms_logs_daily")
@@ -0,0 +1,37 @@
+"""add listing index to study_material_categories
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect
+
+revision: str = "f2a3b4c5d6e7"
+down_revision: Union[str, None] = "e1f2a3b4c5d6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = "ix_study_material_categories_deleted_id"
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if not inspect(conn).has_table("study_material_categories"):
+        return
+    indexes = {i["name"] for i in inspect(conn).get_indexes("study_material_categories")}
+    if INDEX_NAME not in indexes:
+        # Serves the category listing: WHERE deleted_at IS NULL ORDER BY id
+        op.create_index(INDEX_NAME, "study_material_categories", ["deleted_at", "id"])
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if not inspect(conn).has_table("study_material_categories"):
+        return
+    indexes = {i["name"] for i in inspect(conn).get_indexes("study_material_categories")}
+    if INDEX_NAME in indexes:
+        op.drop_index(INDEX_NAME, table_name="study_material_categories")
@@ -1220,8 +1220,8 @@ def delete_subtopic(subtopic_id):
                 # Delete VdoCipher video if this is a DRM-protected video
                 if material.vdocipher_video_id and material.requires_drm:
                     try:
-                        from services.vdocipher_service import VdoCipherService
-                        vdocipher = VdoCipherService()
+                        from services.vdocipher_service import get_vdocipher
+                        vdocipher = get_vdocipher()
                         vdocipher.delete_video(material.vdocipher_video_id)
                         logger.info(f"✅ Deleted VdoCipher video {material.vdocipher_video_id} for material {material.id}")
                     except Exception as vdo_err:
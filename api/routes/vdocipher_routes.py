@@ -6,7 +6,7 @@ Handles video playback OTP generation and video management
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.exceptions import BadRequest, NotFound, Forbidden
-from services.vdocipher_service import VdoCipherService
+from services.vdocipher_service import get_vdocipher
 from studies.models.models import SubtopicMaterial
 from auth.models.models import User
 from database.db_connector import db_session
@@ -24,7 +24,7 @@ def get_vdocipher_service():
     global _vdocipher_service
     if _vdocipher_service is None:
         try:
-            _vdocipher_service = VdoCipherService()
+            _vdocipher_service = get_vdocipher()
         except ValueError as e:
             logger.warning(f"VdoCipher service not available: {e}")
             _vdocipher_service = None
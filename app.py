@@ -74,7 +74,7 @@ from api.routes.vdocipher_routes import vdocipher_bp
 app = Flask(__name__)
 
 # Generate a secure secret key if not provided in environment
-JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', secrets.token_hex(32))
+JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or secrets.token_hex(32)
 
 # Configure JWT
 app.config['JWT_SECRET_KEY'] = JWT_SECRET_KEY
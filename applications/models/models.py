@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, BigInteger, Enum, Float, func, Text, Date, Time, Numeric
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, BigInteger, Enum, Float, func, Text, Date, Time, Numeric, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from database.db_connector import Base
@@ -347,6 +347,10 @@ class SmsLog(Base):
     """Audit log for all SMS sent. Used for reconciliation and compliance."""
 
     __tablename__ = "sms_logs"
+    __table_args__ = (
+        # Listing index for /api/sms/logs (newest first, filtered by process/status)
+        Index("ix_sms_logs_created_process_status", "created_at", "process_name", "status"),
+    )
 
     id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, index=True)
     sender_id = Column(String(100), nullable=False)
@@ -367,6 +371,21 @@ class SmsLog(Base):
         return f"<SmsLog(id={self.id}, recipient={self.recipient}, process={self.process_name}, status={self.status})>"
 
 
+class SmsLogDaily(Base):
+    """Per-day sms_logs totals by process and status. Kept in step with sms_logs by the SMS audit writer."""
+
+    __tablename__ = "sms_logs_daily"
+
+    day = Column(Date, primary_key=True)
+    process_name = Column(String(100), primary_key=True)
+    status = Column(String(20), primary_key=True)
+    log_count = Column(BigInteger, nullable=False, default=0)
+    sms_count = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<SmsLogDaily(day={self.day}, process={self.process_name}, status={self.status}, logs={self.log_count})>"
+
+
 class MailBatchStatus(str, Enum):
     pending = "PENDING"
     processing = "PROCESSING"
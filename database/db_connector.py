@@ -2,6 +2,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
+import logging
 import os
 from dotenv import load_dotenv
 from typing import Optional
@@ -10,6 +11,8 @@ from .base import Base
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Database connection parameters (XAMPP default settings)
 DB_USER = os.getenv('DB_USER', 'ocpac')
 DB_PASSWORD = os.getenv('DB_PASSWORD', 'oCpAc%402025')  # XAMPP default has no password
@@ -20,16 +23,19 @@ DB_NAME = os.getenv('DB_NAME', 'ocpac')
 # Create database URL for MySQL with explicit port using pymysql
 DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    DATABASE_URL,
-    pool_size=5,
-    max_overflow=10,
+# Connection pool settings, per process. Gunicorn runs several sync workers,
+# so keep pool_size * workers below MySQL's max_connections.
+ENGINE_OPTIONS = dict(
+    pool_size=int(os.getenv('DB_POOL_SIZE', '5')),
+    max_overflow=int(os.getenv('DB_MAX_OVERFLOW', '10')),
     pool_timeout=30,
-    pool_recycle=3600,
+    pool_recycle=int(os.getenv('DB_POOL_RECYCLE', '1800')),  # below MySQL wait_timeout
     pool_pre_ping=True  # Enable automatic reconnection
 )
 
+# Create SQLAlchemy engine
+engine = create_engine(DATABASE_URL, **ENGINE_OPTIONS)
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -43,6 +49,20 @@ def init_db():
     """Initialize the database by creating all tables"""
     Base.metadata.create_all(bind=engine)
 
+def warm_pool(size: Optional[int] = None):
+    """Open pooled connections up front so the first requests skip connect/auth"""
+    size = int(os.getenv('DB_POOL_WARM', '2')) if size is None else size
+    connections = []
+    try:
+        for _ in range(min(size, ENGINE_OPTIONS['pool_size'])):
+            connections.append(engine.connect())
+    except SQLAlchemyError:
+        logger.warning("Error warming database pool", exc_info=True)
+    finally:
+        # Closing returns each connection to the pool instead of disconnecting
+        for connection in connections:
+            connection.close()
+
 def get_db():
     """Get a database session"""
     db_connector = DBConnector()
@@ -63,14 +83,7 @@ class DBConnector:
         """Initialize database connection"""
         try:
             # Create engine with MySQL-specific configuration
-            self._engine = create_engine(
-                DATABASE_URL,
-                pool_size=5,
-                max_overflow=10,
-                pool_timeout=30,
-                pool_recycle=3600,
-                pool_pre_ping=True  # Enable automatic reconnection
-            )
+            self._engine = create_engine(DATABASE_URL, **ENGINE_OPTIONS)
             
             # Create session factory
             self._SessionFactory = scoped_session(
@@ -29,4 +29,10 @@ tmp_upload_dir = None
 
 # SSL
 keyfile = None
-certfile = None 
\ No newline at end of file
+certfile = None 
+
+# Database pool warm-up. Runs in each worker after fork so no connection
+# is shared between processes.
+def post_fork(server, worker):
+    from database.db_connector import warm_pool
+    warm_pool()
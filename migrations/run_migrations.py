@@ -5,10 +5,14 @@ import sys
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
 
-from database.db_connector import DBConnector
-from create_sub_topics_table import upgrade
 
 def run_migrations():
+    # Imported lazily so the script does not build the SQLAlchemy engine and
+    # model tree until a migration is actually going to run.
+    from importlib import import_module
+    from database.db_connector import DBConnector
+    upgrade = import_module('create_sub_topics_table').upgrade
+
     db = DBConnector()
     session = db.get_session()
     try:
@@ -16,13 +16,25 @@ depends_on = None
 
 def upgrade() -> None:
     # First, we need to handle duplicate visitor_ids
-    # We'll keep the most recent record for each visitor_id
+    # We'll keep the most recent record for each visitor_id. The ids to keep
+    # are collected with one GROUP BY pass, then everything else is removed
+    # with an anti-join, instead of self-joining every pair of duplicates.
     op.execute("""
-        DELETE t1 FROM user_devices t1
-        INNER JOIN user_devices t2
-        WHERE t1.visitor_id = t2.visitor_id
-        AND t1.id < t2.id
+        CREATE TEMPORARY TABLE keep_user_devices (id BIGINT PRIMARY KEY)
     """)
+    op.execute("""
+        INSERT INTO keep_user_devices (id)
+        SELECT MAX(id) FROM user_devices
+        WHERE visitor_id IS NOT NULL
+        GROUP BY visitor_id
+    """)
+    op.execute("""
+        DELETE ud FROM user_devices ud
+        LEFT JOIN keep_user_devices k ON ud.id = k.id
+        WHERE k.id IS NULL
+        AND ud.visitor_id IS NOT NULL
+    """)
+    op.execute("DROP TEMPORARY TABLE keep_user_devices")
     
     # Now add the unique constraint
     op.create_unique_constraint('uq_user_devices_visitor_id', 'user_devices', ['visitor_id'])
@@ -9,6 +9,7 @@ import pymysql
 import time
 import json
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # Configuration
 REDIS_HOST = 'localhost'
@@ -27,29 +28,48 @@ def get_redis_connection():
     """Get Redis connection"""
     return redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, decode_responses=True)
 
+_db_connection = None
+
 def get_db_connection():
-    """Get MySQL connection"""
-    return pymysql.connect(**DB_CONFIG)
+    """Get the shared MySQL connection, reconnecting if it has dropped.
 
-def check_queue_status():
-    """Check Redis queue status"""
-    try:
-        r = get_redis_connection()
-        
-        # Check queue length
-        queue_length = r.llen('video_processing')
-        
-        # Check for active tasks
-        active_tasks = r.hgetall('celery-task-meta-*')
-        
-        print(f"📊 Queue Status - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"   Queue Length: {queue_length}")
-        print(f"   Active Tasks: {len(active_tasks)}")
-        
-        return queue_length, len(active_tasks)
-    except Exception as e:
-        print(f"❌ Redis Error: {e}")
-        return None, None
+    pymysql only speaks the text protocol, so server-side prepared
+    statements are not available; reusing one connection across checks
+    at least avoids a TCP handshake and auth round-trip per query.
+    """
+    global _db_connection
+    if _db_connection is None or not _db_connection.open:
+        _db_connection = pymysql.connect(**DB_CONFIG)
+    else:
+        _db_connection.ping(reconnect=True)
+        # End any previous read transaction so each check sees fresh data
+        _db_connection.rollback()
+    return _db_connection
+
+def close_db_connection():
+    """Close the shared MySQL connection"""
+    global _db_connection
+    if _db_connection is not None and _db_connection.open:
+        _db_connection.close()
+    _db_connection = None
+
+def get_queue_status():
+    """Fetch Redis queue length and active task count"""
+    r = get_redis_connection()
+    
+    # Check queue length
+    queue_length = r.llen('video_processing')
+    
+    # Check for active tasks
+    active_tasks = r.hgetall('celery-task-meta-*')
+    
+    return queue_length, len(active_tasks)
+
+def print_queue_status(queue_length, active_tasks):
+    """Print Redis queue status"""
+    print(f"📊 Queue Status - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"   Queue Length: {queue_length}")
+    print(f"   Active Tasks: {active_tasks}")
 
 def check_processing_materials():
     """Check materials currently being processed"""
@@ -77,100 +97,108 @@ def check_processing_materials():
         else:
             print("\n✅ No materials currently processing")
         
-        conn.close()
         return materials
     except Exception as e:
         print(f"❌ Database Error: {e}")
         return []
 
-def check_stuck_tasks():
-    """Check for tasks that might be stuck (processing for > 30 minutes)"""
+# Materials stuck in 'processing' for more than 30 minutes. Kept sargable so
+# MySQL can range-scan updated_at instead of evaluating TIMESTAMPDIFF per row.
+STUCK_TASK_PREDICATE = """
+    processing_status = 'processing'
+    AND updated_at < NOW() - INTERVAL 30 MINUTE
+"""
+
+def print_stuck_tasks(stuck_materials):
+    """Print a report of stuck materials"""
+    if stuck_materials:
+        print(f"\n⚠️  POTENTIALLY STUCK TASKS ({len(stuck_materials)}):")
+        for material in stuck_materials:
+            id, name, status, progress, updated, minutes = material
+            print(f"   🚨 ID {id}: {name[:30]}... | {status} | {progress}% | {minutes}min")
+            print(f"      Last updated: {updated}")
+    else:
+        print("\n✅ No stuck tasks detected")
+
+def detect_and_clear_stuck_tasks():
+    """Detect and clear stuck tasks in a single transaction.
+
+    The stuck rows are locked while they are read, so the UPDATE touches
+    exactly the rows that were reported and no separate detection pass is
+    needed. Returns the list of cleared materials.
+    """
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Find materials processing for more than 30 minutes
-        cursor.execute("""
+        cursor.execute(f"""
             SELECT id, name, processing_status, processing_progress, 
                    updated_at, TIMESTAMPDIFF(MINUTE, updated_at, NOW()) as minutes_processing
             FROM subtopic_materials 
-            WHERE processing_status = 'processing' 
-            AND TIMESTAMPDIFF(MINUTE, updated_at, NOW()) > 30
+            WHERE {STUCK_TASK_PREDICATE}
             ORDER BY updated_at ASC
+            FOR UPDATE SKIP LOCKED
         """)
         
         stuck_materials = cursor.fetchall()
+        print_stuck_tasks(stuck_materials)
         
         if stuck_materials:
-            print(f"\n⚠️  POTENTIALLY STUCK TASKS ({len(stuck_materials)}):")
-            for material in stuck_materials:
-                id, name, status, progress, updated, minutes = material
-                print(f"   🚨 ID {id}: {name[:30]}... | {status} | {progress}% | {minutes}min")
-                print(f"      Last updated: {updated}")
-        else:
-            print("\n✅ No stuck tasks detected")
+            ids = [material[0] for material in stuck_materials]
+            placeholders = ', '.join(['%s'] * len(ids))
+            cursor.execute(f"""
+                UPDATE subtopic_materials 
+                SET processing_status = 'failed', 
+                    processing_error = 'Task stuck - cleared by monitor'
+                WHERE id IN ({placeholders})
+            """, ids)
+            print(f"\n🧹 Cleared {cursor.rowcount} stuck tasks")
         
-        conn.close()
-        return stuck_materials
-    except Exception as e:
-        print(f"❌ Database Error: {e}")
-        return []
-
-def clear_stuck_tasks():
-    """Clear stuck tasks and reset their status"""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Find and reset stuck tasks
-        cursor.execute("""
-            UPDATE subtopic_materials 
-            SET processing_status = 'failed', 
-                processing_error = 'Task stuck - cleared by monitor'
-            WHERE processing_status = 'processing' 
-            AND TIMESTAMPDIFF(MINUTE, updated_at, NOW()) > 30
-        """)
-        
-        affected = cursor.rowcount
         conn.commit()
-        conn.close()
-        
-        if affected > 0:
-            print(f"\n🧹 Cleared {affected} stuck tasks")
-        else:
-            print("\n✅ No stuck tasks to clear")
-            
-        return affected
+        return stuck_materials
     except Exception as e:
         print(f"❌ Error clearing stuck tasks: {e}")
-        return 0
+        return []
 
 def main():
     """Main monitoring function"""
     print("🔍 Celery Queue Monitor")
     print("=" * 50)
     
-    # Check queue status
-    queue_length, active_tasks = check_queue_status()
-    
-    # Check processing materials
-    processing_materials = check_processing_materials()
-    
-    # Check for stuck tasks
-    stuck_tasks = check_stuck_tasks()
+    try:
+        run_checks()
+    finally:
+        close_db_connection()
+
+def run_checks():
+    """Run all monitor checks over the shared connections"""
+    # The Redis check is independent of MySQL, so overlap it with the
+    # database checks. The database checks share one connection and
+    # therefore stay sequential.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        queue_future = executor.submit(get_queue_status)
+        
+        # Check processing materials
+        processing_materials = check_processing_materials()
+        
+        # Detect and auto-clear stuck tasks in one pass
+        print(f"\n🤖 Checking for stuck tasks (auto-clear enabled)...")
+        stuck_tasks = detect_and_clear_stuck_tasks()
+        
+        # Check queue status
+        print()
+        try:
+            queue_length, active_tasks = queue_future.result()
+            print_queue_status(queue_length, active_tasks)
+        except Exception as e:
+            print(f"❌ Redis Error: {e}")
+            queue_length, active_tasks = None, None
     
     # Summary
     print(f"\n📈 Summary:")
     print(f"   Queue: {queue_length} tasks")
     print(f"   Processing: {len(processing_materials)} materials")
-    print(f"   Stuck: {len(stuck_tasks)} materials")
-    
-    # Auto-clear stuck tasks if any
-    if stuck_tasks:
-        print(f"\n🤖 Auto-clearing stuck tasks...")
-        cleared = clear_stuck_tasks()
-        if cleared > 0:
-            print(f"✅ Cleared {cleared} stuck tasks")
+    print(f"   Stuck (cleared): {len(stuck_tasks)} materials")
 
 if __name__ == "__main__":
     main()
@@ -4,17 +4,25 @@ Handles public contact form submissions and sends emails via SendGrid API or SMT
 """
 
 from flask import Blueprint, request, jsonify
+from flask_jwt_extended import verify_jwt_in_request
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.message import EmailMessage
+from email.policy import SMTP as SMTP_POLICY
 import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from jinja2 import Environment
+from markupsafe import Markup, escape
 import logging
 
 # Try to import SendGrid (optional - falls back to SMTP if not available)
 try:
     from sendgrid import SendGridAPIClient
-    from sendgrid.helpers.mail import Mail, Email
     SENDGRID_AVAILABLE = True
 except ImportError:
     SENDGRID_AVAILABLE = False
@@ -25,65 +33,72 @@ load_dotenv()
 # Configure logging
 logger = logging.getLogger(__name__)
 
+
+@dataclass(frozen=True)
+class ContactEmailConfig:
+    """Email settings for the contact form, read once from the environment"""
+    sendgrid_api_key: Optional[str]
+    email_from: Optional[str]
+    email_to: Optional[str]
+    email_cc: Optional[str]  # Optional CC recipient
+    smtp_host: str
+    smtp_port: int
+    smtp_user: str
+    smtp_pass: Optional[str]
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            sendgrid_api_key=os.getenv('SENDGRID_API_KEY'),
+            email_from=os.getenv('EMAIL_FROM'),
+            email_to=os.getenv('EMAIL_TO'),
+            email_cc=os.getenv('EMAIL_CC'),
+            smtp_host=os.getenv('SMTP_HOST', 'smtp.sendgrid.net'),
+            smtp_port=int(os.getenv('SMTP_PORT', '2525')),
+            smtp_user=os.getenv('SMTP_USER', 'apikey'),  # SendGrid uses 'apikey' as username
+            smtp_pass=os.getenv('SMTP_PASS') or os.getenv('SENDGRID_API_KEY'),  # Can use API key as password
+        )
+
+
+EMAIL_CONFIG = ContactEmailConfig.from_env()
+
 # Create blueprint
 contact_bp = Blueprint('contact', __name__)
 
+# Background pool for outbound contact emails so the request does not wait
+# on the SendGrid/SMTP round-trips
+_email_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='contact-email')
 
-def validate_contact_data(data):
-    """Validate contact form data"""
-    required_fields = ['name', 'email', 'subject', 'message']
-    
-    for field in required_fields:
-        if not data.get(field):
-            return False, f"Missing required field: {field}"
-    
-    # Basic email validation
-    email = data.get('email', '')
-    if '@' not in email or '.' not in email:
-        return False, "Invalid email address"
-    
-    return True, None
+# Shared authenticated SMTP connection, rotated after SMTP_MAX_AGE seconds or
+# SMTP_MAX_MESSAGES sends so we do not hold on to stale sockets
+SMTP_MAX_AGE = 100
+SMTP_MAX_MESSAGES = 100
+_smtp_lock = threading.Lock()
+_smtp_conn = None
+_smtp_conn_key = None
+_smtp_conn_opened_at = 0.0
+_smtp_conn_sent = 0
 
+# Contact email bodies, compiled once at import. The HTML template is
+# autoescaped so submitted values cannot inject markup.
+_text_env = Environment(autoescape=False)
+_html_env = Environment(autoescape=True)
+_html_env.filters['nl2br'] = lambda value: escape(value).replace('\n', Markup('<br>'))
 
-def send_contact_email_sendgrid_api(name, email, phone, subject, message):
-    """
-    Send contact form email via SendGrid API (HTTPS - works on DigitalOcean)
-    
-    Args:
-        name: Sender's name
-        email: Sender's email
-        phone: Sender's phone (optional)
-        subject: Email subject category
-        message: Email message content
-    
-    Returns:
-        tuple: (success: bool, error_message: str or None)
-    """
-    try:
-        sendgrid_api_key = os.getenv('SENDGRID_API_KEY')
-        email_from = os.getenv('EMAIL_FROM')
-        email_to = os.getenv('EMAIL_TO')
-        email_cc = os.getenv('EMAIL_CC')  # Optional CC recipient
-        
-        if not all([sendgrid_api_key, email_from, email_to]):
-            logger.error("Missing SendGrid configuration in environment variables")
-            return False, "Email service not configured"
-        
-        # Create email content
-        text_content = f"""New Contact Form Submission
+CONTACT_EMAIL_TEXT_TEMPLATE = _text_env.from_string("""New Contact Form Submission
 
-Name: {name}
-Email: {email}
-Phone: {phone or 'Not provided'}
-Subject: {subject}
+Name: {{ name }}
+Email: {{ email }}
+Phone: {{ phone or 'Not provided' }}
+Subject: {{ subject }}
 
 Message:
-{message}
+{{ message }}
 
 ---
-This email was sent from the DCRC contact form at dcrc.ac.tz"""
-        
-        html_content = f"""<!DOCTYPE html>
+This email was sent from the DCRC contact form at dcrc.ac.tz""")
+
+CONTACT_EMAIL_HTML_TEMPLATE = _html_env.from_string("""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
@@ -94,16 +109,16 @@ This email was sent from the DCRC contact form at dcrc.ac.tz"""
         <h2 style="color: #285F68; margin-bottom: 20px;">New Contact Form Submission</h2>
         
         <div style="background: #f5f5f5; padding: 20px; border-radius: 8px; margin: 20px 0;">
-            <p style="margin: 10px 0;"><strong>Name:</strong> {name}</p>
-            <p style="margin: 10px 0;"><strong>Email:</strong> <a href="mailto:{email}" style="color: #285F68;">{email}</a></p>
-            <p style="margin: 10px 0;"><strong>Phone:</strong> {phone or 'Not provided'}</p>
-            <p style="margin: 10px 0;"><strong>Subject:</strong> {subject}</p>
+            <p style="margin: 10px 0;"><strong>Name:</strong> {{ name }}</p>
+            <p style="margin: 10px 0;"><strong>Email:</strong> <a href="mailto:{{ email }}" style="color: #285F68;">{{ email }}</a></p>
+            <p style="margin: 10px 0;"><strong>Phone:</strong> {{ phone or 'Not provided' }}</p>
+            <p style="margin: 10px 0;"><strong>Subject:</strong> {{ subject }}</p>
         </div>
         
         <div style="margin: 20px 0;">
             <h3 style="color: #285F68; margin-bottom: 10px;">Message:</h3>
             <div style="background: #ffffff; padding: 15px; border-left: 4px solid #285F68; line-height: 1.6; color: #333;">
-                {message.replace(chr(10), '<br>')}
+                {{ message|nl2br }}
             </div>
         </div>
         
@@ -114,55 +129,194 @@ This email was sent from the DCRC contact form at dcrc.ac.tz"""
         </p>
         
         <p style="color: #666; font-size: 12px; margin: 10px 0;">
-            You can reply directly to this email to respond to {name}.
+            You can reply directly to this email to respond to {{ name }}.
         </p>
     </div>
 </body>
-</html>"""
+</html>""")
+
+# Shared SendGrid client, created on first use from EMAIL_CONFIG
+_sg_client = None
+
+# After a SendGrid API failure, go straight to SMTP for this many seconds
+# instead of paying for a failing API call on every email
+SENDGRID_COOLDOWN = 30
+_sendgrid_skip_until = 0.0
+
+
+REQUIRED_CONTACT_FIELDS = ('name', 'email', 'subject', 'message')
+
+# local@domain.tld with no whitespace and a 2+ character TLD (letters,
+# digits and hyphens, so punycode TLDs like .xn--p1ai are accepted)
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[A-Za-z0-9-]{2,}$')
+
+
+def validate_contact_data(data):
+    """Validate contact form data"""
+    for field in REQUIRED_CONTACT_FIELDS:
+        if not data.get(field):
+            return False, f"Missing required field: {field}"
+    
+    # Basic email validation
+    email = data.get('email', '').strip()
+    if not _EMAIL_RE.match(email):
+        return False, "Invalid email address"
+    
+    return True, None
+
+
+def render_contact_email(name, email, phone, subject, message):
+    """
+    Render the contact email bodies
+    
+    Returns:
+        tuple: (text_content: str, html_content: str)
+    """
+    context = {
+        'name': name,
+        'email': email,
+        'phone': phone,
+        'subject': subject,
+        'message': message,
+    }
+    text_content = CONTACT_EMAIL_TEXT_TEMPLATE.render(context)
+    html_content = CONTACT_EMAIL_HTML_TEMPLATE.render(context)
+    return text_content, html_content
+
+
+def _get_sendgrid_client():
+    """Return the shared SendGridAPIClient"""
+    global _sg_client
+    if _sg_client is None:
+        _sg_client = SendGridAPIClient(EMAIL_CONFIG.sendgrid_api_key)
+    return _sg_client
+
+
+def send_contact_email_sendgrid_api(name, email, phone, subject, message):
+    """
+    Send contact form email via SendGrid API (HTTPS - works on DigitalOcean)
+    
+    Args:
+        name: Sender's name
+        email: Sender's email
+        phone: Sender's phone (optional)
+        subject: Email subject category
+        message: Email message content
+    
+    Returns:
+        tuple: (success: bool, error_message: str or None)
+    """
+    try:
+        sendgrid_api_key = EMAIL_CONFIG.sendgrid_api_key
+        email_from = EMAIL_CONFIG.email_from
+        email_to = EMAIL_CONFIG.email_to
+        email_cc = EMAIL_CONFIG.email_cc
         
-        # Create SendGrid message
-        # Use string format for emails (more reliable with SendGrid Python library)
-        mail = Mail(
-            from_email=(email_from, "DCRC Contact Form"),  # Tuple format: (email, name)
-            to_emails=[email_to],  # List of email strings
-            subject=f"DCRC Contact Form: {subject}",
-            plain_text_content=text_content,
-            html_content=html_content
-        )
+        if not all([sendgrid_api_key, email_from, email_to]):
+            logger.error("Missing SendGrid configuration in environment variables")
+            return False, "Email service not configured"
+        
+        # Create email content
+        text_content, html_content = render_contact_email(name, email, phone, subject, message)
+        
+        # Build the v3 mail/send body directly rather than going through the
+        # Mail helper, which only copies everything into this same shape
+        personalization = {'to': [{'email': email_to}]}
         
         # Add CC recipient if configured
         if email_cc:
-            mail.add_cc(email_cc)
-            logger.info(f"CC recipient added: {email_cc}")
-        
-        # Set reply-to as tuple
-        mail.reply_to = (email, name)
+            personalization['cc'] = [{'email': email_cc}]
+            logger.info("CC recipient added: %s", email_cc)
+        
+        mail_body = {
+            'personalizations': [personalization],
+            'from': {'email': email_from, 'name': 'DCRC Contact Form'},
+            'reply_to': {'email': email, 'name': name},
+            'subject': f"DCRC Contact Form: {subject}",
+            'content': [
+                {'type': 'text/plain', 'value': text_content},
+                {'type': 'text/html', 'value': html_content},
+            ],
+        }
         
         # Send via SendGrid API
-        logger.info(f"Sending email via SendGrid API from {name} ({email}) to {email_to}")
-        logger.debug(f"From: {email_from}, To: {email_to}, Subject: DCRC Contact Form: {subject}")
+        logger.info("Sending email via SendGrid API from %s (%s) to %s", name, email, email_to)
+        logger.debug("From: %s, To: %s, Subject: DCRC Contact Form: %s", email_from, email_to, subject)
         
-        sg = SendGridAPIClient(sendgrid_api_key)
-        response = sg.send(mail)
+        sg = _get_sendgrid_client()
+        response = sg.client.mail.send.post(request_body=mail_body)
         
-        logger.info(f"SendGrid API response status: {response.status_code}")
-        logger.debug(f"SendGrid API response headers: {dict(response.headers)}")
+        logger.info("SendGrid API response status: %s", response.status_code)
+        logger.debug("SendGrid API response headers: %s", dict(response.headers))
         
         if response.status_code in [200, 201, 202]:
-            logger.info(f"✅ Contact email sent successfully via SendGrid API (status: {response.status_code})")
+            logger.info("✅ Contact email sent successfully via SendGrid API (status: %s)", response.status_code)
             return True, None
         else:
             error_body = response.body.decode('utf-8') if response.body else "No error body"
-            logger.error(f"SendGrid API returned status {response.status_code}: {error_body}")
+            logger.error("SendGrid API returned status %s: %s", response.status_code, error_body)
             return False, f"SendGrid API error: {response.status_code} - {error_body}"
             
     except Exception as e:
-        import traceback
-        logger.error(f"Error sending email via SendGrid API: {str(e)}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception("Error sending email via SendGrid API: %s", e)
         return False, f"Failed to send email: {str(e)}"
 
 
+def _close_smtp():
+    """Close the shared SMTP connection (caller must hold _smtp_lock)"""
+    global _smtp_conn, _smtp_conn_key
+    if _smtp_conn is not None:
+        try:
+            _smtp_conn.quit()
+        except Exception:
+            pass
+    _smtp_conn = None
+    _smtp_conn_key = None
+
+
+def _get_smtp(smtp_host, smtp_port, smtp_user, smtp_pass):
+    """
+    Return a live, authenticated SMTP connection (caller must hold _smtp_lock)
+    
+    Reuses the shared connection while it is young enough, has sent fewer than
+    SMTP_MAX_MESSAGES emails and still answers NOOP; otherwise reconnects.
+    """
+    global _smtp_conn, _smtp_conn_key, _smtp_conn_opened_at, _smtp_conn_sent
+    key = (smtp_host, smtp_port, smtp_user, smtp_pass)
+    
+    if _smtp_conn is not None:
+        expired = (
+            _smtp_conn_key != key
+            or time.monotonic() - _smtp_conn_opened_at > SMTP_MAX_AGE
+            or _smtp_conn_sent >= SMTP_MAX_MESSAGES
+        )
+        if not expired:
+            try:
+                if _smtp_conn.noop()[0] == 250:
+                    return _smtp_conn
+            except (smtplib.SMTPException, OSError):
+                pass
+        _close_smtp()
+    
+    logger.info("Connecting to SMTP server: %s:%s", smtp_host, smtp_port)
+    server = smtplib.SMTP(smtp_host, smtp_port)
+    try:
+        server.set_debuglevel(0)  # Set to 1 for debugging
+        server.starttls()  # Upgrade to secure connection
+        
+        logger.info("Logging in as: %s", smtp_user)
+        server.login(smtp_user, smtp_pass)
+    except Exception:
+        server.close()
+        raise
+    
+    _smtp_conn = server
+    _smtp_conn_key = key
+    _smtp_conn_opened_at = time.monotonic()
+    _smtp_conn_sent = 0
+    return server
+
+
 def send_contact_email_smtp(name, email, phone, subject, message):
     """
     Send contact form email via SMTP (SendGrid SMTP on port 2525 or other providers)
@@ -177,15 +331,16 @@ def send_contact_email_smtp(name, email, phone, subject, message):
     Returns:
         tuple: (success: bool, error_message: str or None)
     """
+    global _smtp_conn_sent
     try:
-        # Get SMTP configuration from environment
-        smtp_host = os.getenv('SMTP_HOST', 'smtp.sendgrid.net')
-        smtp_port = int(os.getenv('SMTP_PORT', '2525'))
-        smtp_user = os.getenv('SMTP_USER', 'apikey')  # SendGrid uses 'apikey' as username
-        smtp_pass = os.getenv('SMTP_PASS') or os.getenv('SENDGRID_API_KEY')  # Can use API key as password
-        email_from = os.getenv('EMAIL_FROM')
-        email_to = os.getenv('EMAIL_TO')
-        email_cc = os.getenv('EMAIL_CC')  # Optional CC recipient
+        # Get SMTP configuration
+        smtp_host = EMAIL_CONFIG.smtp_host
+        smtp_port = EMAIL_CONFIG.smtp_port
+        smtp_user = EMAIL_CONFIG.smtp_user
+        smtp_pass = EMAIL_CONFIG.smtp_pass
+        email_from = EMAIL_CONFIG.email_from
+        email_to = EMAIL_CONFIG.email_to
+        email_cc = EMAIL_CONFIG.email_cc
         
         # Validate SMTP configuration
         if not all([smtp_pass, email_from, email_to]):
@@ -193,108 +348,55 @@ def send_contact_email_smtp(name, email, phone, subject, message):
             return False, "Email service not configured"
         
         # Create message
-        msg = MIMEMultipart('alternative')
+        msg = EmailMessage()
         msg['From'] = email_from
         msg['To'] = email_to
         if email_cc:
             msg['Cc'] = email_cc
-            logger.info(f"CC recipient added: {email_cc}")
+            logger.info("CC recipient added: %s", email_cc)
         msg['Reply-To'] = email
         msg['Subject'] = f"DCRC Contact Form: {subject}"
         
-        # Plain text version
-        text_content = f"""
-New Contact Form Submission
-
-Name: {name}
-Email: {email}
-Phone: {phone or 'Not provided'}
-Subject: {subject}
-
-Message:
-{message}
-
----
-This email was sent from the DCRC contact form at dcrc.ac.tz
-        """
-        
-        # HTML version
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin: 0; padding: 0; font-family: Arial, sans-serif;">
-    <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-        <h2 style="color: #285F68; margin-bottom: 20px;">New Contact Form Submission</h2>
-        
-        <div style="background: #f5f5f5; padding: 20px; border-radius: 8px; margin: 20px 0;">
-            <p style="margin: 10px 0;"><strong>Name:</strong> {name}</p>
-            <p style="margin: 10px 0;"><strong>Email:</strong> <a href="mailto:{email}" style="color: #285F68;">{email}</a></p>
-            <p style="margin: 10px 0;"><strong>Phone:</strong> {phone or 'Not provided'}</p>
-            <p style="margin: 10px 0;"><strong>Subject:</strong> {subject}</p>
-        </div>
-        
-        <div style="margin: 20px 0;">
-            <h3 style="color: #285F68; margin-bottom: 10px;">Message:</h3>
-            <div style="background: #ffffff; padding: 15px; border-left: 4px solid #285F68; line-height: 1.6; color: #333;">
-                {message.replace(chr(10), '<br>')}
-            </div>
-        </div>
-        
-        <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
-        
-        <p style="color: #666; font-size: 12px; margin: 10px 0;">
-            This email was sent from the DCRC contact form at <a href="https://dcrc.ac.tz" style="color: #285F68;">dcrc.ac.tz</a>
-        </p>
-        
-        <p style="color: #666; font-size: 12px; margin: 10px 0;">
-            You can reply directly to this email to respond to {name}.
-        </p>
-    </div>
-</body>
-</html>
-        """
+        # Plain text and HTML versions
+        text_content, html_content = render_contact_email(name, email, phone, subject, message)
         
         # Attach both versions
-        part1 = MIMEText(text_content, 'plain')
-        part2 = MIMEText(html_content, 'html')
-        msg.attach(part1)
-        msg.attach(part2)
+        msg.set_content(text_content)
+        msg.add_alternative(html_content, subtype='html')
+        # Serialize once with CRLF line endings, as send_message would
+        raw_message = msg.as_bytes(policy=SMTP_POLICY)
         
-        # Connect to SMTP server and send email
-        logger.info(f"Connecting to SMTP server: {smtp_host}:{smtp_port}")
+        # Prepare recipients list (To + CC)
+        recipients = [email_to]
+        if email_cc:
+            recipients.append(email_cc)
         
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            server.set_debuglevel(0)  # Set to 1 for debugging
-            server.starttls()  # Upgrade to secure connection
-            
-            logger.info(f"Logging in as: {smtp_user}")
-            server.login(smtp_user, smtp_pass)
+        # Send over the shared SMTP connection
+        with _smtp_lock:
+            server = _get_smtp(smtp_host, smtp_port, smtp_user, smtp_pass)
             
-            # Prepare recipients list (To + CC)
-            recipients = [email_to]
-            if email_cc:
-                recipients.append(email_cc)
+            logger.info("Sending email from %s to %s (CC: %s)", email_from, email_to, email_cc or "none")
+            try:
+                server.sendmail(email_from, recipients, raw_message)
+            except (smtplib.SMTPServerDisconnected, OSError):
+                # Drop the broken connection so the next send reconnects
+                _close_smtp()
+                raise
+            _smtp_conn_sent += 1
             
-            logger.info(f"Sending email from {email_from} to {email_to}" + (f" (CC: {email_cc})" if email_cc else ""))
-            server.send_message(msg, to_addrs=recipients)
-            
-        logger.info(f"✅ Contact email sent successfully via SMTP from {name} ({email})")
+        logger.info("✅ Contact email sent successfully via SMTP from %s (%s)", name, email)
         return True, None
         
     except smtplib.SMTPAuthenticationError as e:
-        logger.error(f"SMTP Authentication failed: {str(e)}")
+        logger.error("SMTP Authentication failed: %s", e)
         return False, "Email authentication failed"
     
     except smtplib.SMTPException as e:
-        logger.error(f"SMTP error: {str(e)}")
+        logger.error("SMTP error: %s", e)
         return False, "Failed to send email"
     
     except Exception as e:
-        logger.error(f"Unexpected error sending contact email via SMTP: {str(e)}")
+        logger.error("Unexpected error sending contact email via SMTP: %s", e)
         return False, "An error occurred while sending email"
 
 
@@ -312,21 +414,40 @@ def send_contact_email(name, email, phone, subject, message):
     Returns:
         tuple: (success: bool, error_message: str or None)
     """
-    # Try SendGrid API first (recommended - uses HTTPS, works on DigitalOcean)
-    sendgrid_api_key = os.getenv('SENDGRID_API_KEY')
+    global _sendgrid_skip_until
     
-    if sendgrid_api_key and SENDGRID_AVAILABLE:
-        logger.info("Attempting to send email via SendGrid API...")
-        success, error = send_contact_email_sendgrid_api(name, email, phone, subject, message)
-        if success:
-            return True, None
-        logger.warning(f"SendGrid API failed: {error}, trying SMTP fallback...")
+    # Try SendGrid API first (recommended - uses HTTPS, works on DigitalOcean)
+    if EMAIL_CONFIG.sendgrid_api_key and SENDGRID_AVAILABLE:
+        if time.monotonic() < _sendgrid_skip_until:
+            logger.info("SendGrid API failed recently, skipping it for now")
+        else:
+            logger.info("Attempting to send email via SendGrid API...")
+            success, error = send_contact_email_sendgrid_api(name, email, phone, subject, message)
+            if success:
+                return True, None
+            _sendgrid_skip_until = time.monotonic() + SENDGRID_COOLDOWN
+            logger.warning("SendGrid API failed: %s, trying SMTP fallback...", error)
     
     # Fallback to SMTP (SendGrid SMTP on port 2525 or other providers)
     logger.info("Attempting to send email via SMTP...")
     return send_contact_email_smtp(name, email, phone, subject, message)
 
 
+def _send_contact_email_safe(name, email, phone, subject, message):
+    """Run send_contact_email on the background pool and log the outcome"""
+    try:
+        success, error = send_contact_email(name, email, phone, subject, message)
+        if not success:
+            logger.error("Contact email from %s (%s) failed: %s", name, email, error)
+    except Exception as e:
+        logger.exception("Unexpected error sending contact email from %s (%s): %s", name, email, e)
+
+
+def queue_contact_email(name, email, phone, subject, message):
+    """Queue a contact form email for sending on the background pool"""
+    _email_executor.submit(_send_contact_email_safe, name, email, phone, subject, message)
+
+
 @contact_bp.route('/api/contact', methods=['POST'])
 def submit_contact_form():
     """
@@ -342,10 +463,10 @@ def submit_contact_form():
         "message": "I would like to inquire..."
     }
     
-    Response:
+    Response (202):
     {
         "status": "success",
-        "message": "Email sent successfully"
+        "message": "Email queued for delivery"
     }
     """
     try:
@@ -374,44 +495,40 @@ def submit_contact_form():
         message = data.get('message', '').strip()
         
         # Log the contact attempt
-        logger.info(f"📧 Contact form submission from: {name} ({email}), Subject: {subject}")
+        logger.info("📧 Contact form submission from: %s (%s), Subject: %s", name, email, subject)
         
-        # Send email
-        success, error = send_contact_email(name, email, phone, subject, message)
+        # Send email in the background; delivery failures are logged
+        queue_contact_email(name, email, phone, subject, message)
         
-        if success:
-            return jsonify({
-                'status': 'success',
-                'message': 'Email sent successfully'
-            }), 200
-        else:
-            return jsonify({
-                'status': 'error',
-                'message': error or 'Failed to send email'
-            }), 500
+        return jsonify({
+            'status': 'success',
+            'message': 'Email queued for delivery'
+        }), 202
     
     except Exception as e:
-        logger.error(f"Error processing contact form: {str(e)}")
+        logger.error("Error processing contact form: %s", e)
         return jsonify({
             'status': 'error',
             'message': 'An error occurred while processing your request'
         }), 500
 
 
-@contact_bp.route('/api/contact/test', methods=['GET'])
-def test_smtp_config():
+def _build_config_status():
     """
-    Test endpoint to verify email configuration
-    Returns configuration status (without exposing credentials)
+    Build the /api/contact/test payload from EMAIL_CONFIG
+    
+    Returns:
+        tuple: (payload: dict, http_status: int)
     """
-    sendgrid_api_key = os.getenv('SENDGRID_API_KEY')
-    smtp_host = os.getenv('SMTP_HOST')
-    smtp_port = os.getenv('SMTP_PORT')
-    smtp_user = os.getenv('SMTP_USER')
-    smtp_pass = os.getenv('SMTP_PASS')
-    email_from = os.getenv('EMAIL_FROM')
-    email_to = os.getenv('EMAIL_TO')
-    email_cc = os.getenv('EMAIL_CC')
+    config = EMAIL_CONFIG
+    sendgrid_api_key = config.sendgrid_api_key
+    smtp_host = config.smtp_host
+    smtp_port = config.smtp_port
+    smtp_user = config.smtp_user
+    smtp_pass = config.smtp_pass
+    email_from = config.email_from
+    email_to = config.email_to
+    email_cc = config.email_cc
     
     # Check SendGrid API configuration
     sendgrid_configured = bool(sendgrid_api_key and email_from and email_to)
@@ -435,11 +552,78 @@ def test_smtp_config():
     
     method = 'SendGrid API' if sendgrid_configured else ('SMTP' if smtp_configured else 'None')
     
-    return jsonify({
+    return {
         'status': 'success' if any_configured else 'incomplete',
         'message': f'Email service configured ({method})' if any_configured else 'Email service not configured',
         'method': method,
         'sendgrid_available': SENDGRID_AVAILABLE,
         'configuration': config_status
-    }), 200 if any_configured else 500
+    }, 200 if any_configured else 500
 
+
+# Computed once at import, alongside EMAIL_CONFIG
+CONFIG_STATUS, CONFIG_STATUS_CODE = _build_config_status()
+
+
+# Live probe results are reused for this many seconds so repeated
+# ?probe= requests do not each trigger an outbound SendGrid call
+SENDGRID_PROBE_TTL = 60
+_probe_lock = threading.Lock()
+_probe_result = None
+_probe_checked_at = 0.0
+
+
+def _probe_sendgrid():
+    """
+    Check the SendGrid key with a sandbox-mode mail send
+    
+    Sandbox mode validates the request and the key without delivering
+    anything, and only needs the Mail Send scope that production keys have.
+    """
+    if not (SENDGRID_AVAILABLE and EMAIL_CONFIG.sendgrid_api_key):
+        return 'skipped (SendGrid API not configured)'
+    if not (EMAIL_CONFIG.email_from and EMAIL_CONFIG.email_to):
+        return 'skipped (EMAIL_FROM/EMAIL_TO not configured)'
+    try:
+        sg = _get_sendgrid_client()
+        response = sg.client.mail.send.post(request_body={
+            'personalizations': [{'to': [{'email': EMAIL_CONFIG.email_to}]}],
+            'from': {'email': EMAIL_CONFIG.email_from},
+            'subject': 'DCRC Contact Form: configuration probe',
+            'content': [{'type': 'text/plain', 'value': 'configuration probe'}],
+            'mail_settings': {'sandbox_mode': {'enable': True}},
+        })
+        return f'ok (status: {response.status_code})'
+    except Exception as e:
+        logger.warning("SendGrid probe failed: %s", e)
+        return f'failed: {str(e)}'
+
+
+def _cached_probe_sendgrid():
+    """Return the last probe result if it is younger than SENDGRID_PROBE_TTL"""
+    global _probe_result, _probe_checked_at
+    with _probe_lock:
+        if _probe_result is None or time.monotonic() - _probe_checked_at > SENDGRID_PROBE_TTL:
+            _probe_result = _probe_sendgrid()
+            _probe_checked_at = time.monotonic()
+        return _probe_result
+
+
+@contact_bp.route('/api/contact/test', methods=['GET'])
+def test_smtp_config():
+    """
+    Test endpoint to verify email configuration
+    Returns configuration status (without exposing credentials)
+    
+    Query Params:
+        probe: if set, also makes a live SendGrid API call to verify the key
+               (requires a valid JWT; the result is cached for SENDGRID_PROBE_TTL seconds)
+    """
+    if not request.args.get('probe'):
+        return jsonify(CONFIG_STATUS), CONFIG_STATUS_CODE
+    
+    verify_jwt_in_request()
+    return jsonify({
+        **CONFIG_STATUS,
+        'sendgrid_probe': _cached_probe_sendgrid(),
+    }), CONFIG_STATUS_CODE
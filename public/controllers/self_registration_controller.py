@@ -6,7 +6,9 @@ from datetime import datetime
 from werkzeug.security import generate_password_hash
 from flask_jwt_extended import create_access_token
 import logging
+from concurrent.futures import ThreadPoolExecutor
 import random
+import re
 import string
 from sqlalchemy import text
 from public.controllers.sms_controller import SMSService
@@ -17,6 +19,42 @@ logger = logging.getLogger(__name__)
 
 public = Blueprint('public', __name__)
 
+# Hash method for the auto-generated initial password. It is a one-time
+# 6-digit code that must be changed on first login (reset_password=True), and
+# the replacement is hashed with the full default cost in auth_controller, so
+# a lower iteration count here only trims registration CPU time.
+INITIAL_PASSWORD_HASH_METHOD = 'pbkdf2:sha256:100000'
+
+_NON_DIGIT_RE = re.compile(r'\D')
+# Local number with an optional leading 0, e.g. "0755344162" or "755344162"
+_LOCAL_PHONE_RE = re.compile(r'0?([1-9]\d{8})')
+
+# Background pool for the welcome SMS so registration does not wait on the
+# SMS gateway
+_sms_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='registration-sms')
+
+_student_role_id = None
+
+def get_student_role_id():
+    """Return the STUDENT role id, querying it only until it has been found"""
+    global _student_role_id
+    if _student_role_id is None:
+        _student_role_id = db_session.query(Role.id).filter_by(code='STUDENT').scalar()
+    return _student_role_id
+
+def _send_welcome_sms(phone: str, message: str) -> None:
+    """Send the welcome SMS, logging failures instead of raising"""
+    try:
+        result = SMSService.send_message(
+            phone=phone,
+            message=message,
+            process_name='registration',
+        )
+        if not result.get('success'):
+            logger.error("Welcome SMS to %s failed: %s", phone, result.get('message'))
+    except Exception as e:
+        logger.exception("Welcome SMS to %s failed: %s", phone, e)
+
 def generate_password(length=6):
     """Generate a random numeric password"""
     return ''.join(random.choice(string.digits) for _ in range(length))
@@ -30,12 +68,17 @@ def format_phone_number(phone: str) -> str:
     - "755344162" -> "255755344162"
     """
     # Remove any non-digit characters
-    digits = ''.join(filter(str.isdigit, phone))
+    digits = _NON_DIGIT_RE.sub('', phone)
     
     # If the number starts with 255, return as is
     if digits.startswith('255'):
         return digits
     
+    # Common case: a 9 digit local number, with or without a leading 0
+    match = _LOCAL_PHONE_RE.fullmatch(digits)
+    if match:
+        return f"255{match.group(1)}"
+    
     # If the number starts with 0, remove it
     if digits.startswith('0'):
         digits = digits[1:]
@@ -55,12 +98,11 @@ def self_registration():
         # Format phone number
         original_phone = data.get('phone')
         formatted_phone = format_phone_number(original_phone)
-        logger.info(f"Original phone: {original_phone}, Formatted phone: {formatted_phone}")
+        logger.info("Original phone: %s, Formatted phone: %s", original_phone, formatted_phone)
         
         # Generate a random password
         plain_password = generate_password()
-        # Use the default method (pbkdf2:sha256) for password hashing
-        data['password'] = generate_password_hash(plain_password, method='pbkdf2:sha256')
+        data['password'] = generate_password_hash(plain_password, method=INITIAL_PASSWORD_HASH_METHOD)
         
         # Create new user
         new_user = User(
@@ -78,18 +120,19 @@ def self_registration():
             updated_at=datetime.utcnow()
         )
         
-        db_session.add(new_user)
-        db_session.commit()
-        
         # Get STUDENT role
-        student_role = db_session.query(Role).filter_by(code='STUDENT').first()
-        if not student_role:
+        student_role_id = get_student_role_id()
+        if student_role_id is None:
             raise Exception("STUDENT role not found in the system")
 
+        # Flush to get new_user.id; the user and role are committed together
+        db_session.add(new_user)
+        db_session.flush()
+
         # Create user role with STUDENT role
         user_role = UserRole(
             user_id=new_user.id,
-            role_id=student_role.id,  # STUDENT role ID
+            role_id=student_role_id,
             is_default=True,
             is_active=True,
             created_by=0,  # System user for self-registration
@@ -109,11 +152,7 @@ def self_registration():
         # Send welcome SMS with the new format
         welcome_message = f"Welcome to The African Hub. Your account is ready. Initial password: {plain_password}. Please log in to change it."
 
-        SMSService.send_message(
-            phone=formatted_phone,
-            message=welcome_message,
-            process_name='registration',
-        )
+        _sms_executor.submit(_send_welcome_sms, formatted_phone, welcome_message)
 
         return jsonify({
             "status": "success",
@@ -128,8 +167,7 @@ def self_registration():
                     "email": new_user.email,
                     "phone": formatted_phone,  # Return formatted phone number
                     "status": new_user.status,
-                    "reset_password": new_user.reset_password,
-                    "password": plain_password  # Include the plain password in the response
+                    "reset_password": new_user.reset_password
                 }
             }
         }), 201
@@ -143,7 +181,7 @@ def self_registration():
         }), 409
     except Exception as e:
         db_session.rollback()
-        logger.error(f"Registration error: {str(e)}")  # Add error logging
+        logger.error("Registration error: %s", e)  # Add error logging
         return jsonify({
             "status": "error",
             "message": "Registration failed",
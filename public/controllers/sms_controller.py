@@ -13,30 +13,167 @@ Env vars (recommended):
 All SMS are logged to sms_logs for audit and reconciliation.
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+import atexit
+import functools
 import json
+import queue
 import re
 import os
 import logging
+import threading
+import types
+from concurrent.futures import Future, ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, time
 from typing import List, Dict, Any, Optional
+from sqlalchemy import func, tuple_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from dotenv import load_dotenv
 
-load_dotenv()
+# Parse .env once per process tree (the flag is inherited by forked workers)
+if not os.getenv('_DOTENV_LOADED'):
+    load_dotenv()
+    os.environ['_DOTENV_LOADED'] = '1'
 
 sms_bp = Blueprint('sms', __name__)
 logger = logging.getLogger(__name__)
 
-# Lazy imports for DB (avoid circular imports / import at module load)
+# Lazy imports for DB (avoid circular imports / import at module load).
+# Resolved on first call, then cached.
+@functools.lru_cache(maxsize=1)
 def _get_session_and_model():
     from database.db_connector import SessionLocal
     from applications.models.models import SmsLog
     return SessionLocal, SmsLog
 
 
-def _log_sms(
+@functools.lru_cache(maxsize=1)
+def _get_log_query_deps():
+    from database.db_connector import get_db
+    from applications.models.models import SmsLog, SmsLogDaily
+    return get_db, SmsLog, SmsLogDaily
+
+
+# Audit rows are written by a background thread so SMS calls do not wait on
+# the database. Rows are queued here and committed in batches.
+_LOG_QUEUE_MAXSIZE = 20000
+_LOG_BATCH_SIZE = 200
+_log_queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=_LOG_QUEUE_MAXSIZE)
+_log_worker_lock = threading.Lock()
+_log_worker_thread: Optional[threading.Thread] = None
+
+
+def _daily_rollup(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Group audit rows into sms_logs_daily increments keyed by (day, process_name, status)."""
+    totals: Dict[tuple, List[int]] = {}
+    for row in rows:
+        key = (row["created_at"].date(), row["process_name"], row["status"])
+        t = totals.setdefault(key, [0, 0])
+        t[0] += 1
+        t[1] += row["sms_count"]
+    return [
+        {"day": day, "process_name": proc, "status": status, "log_count": n, "sms_count": segments}
+        for (day, proc, status), (n, segments) in totals.items()
+    ]
+
+
+def _write_sms_log_rows(rows: List[Dict[str, Any]]) -> None:
+    """Insert SMS audit rows, then update their daily rollup. Swallows errors so logging never breaks SMS flow.
+
+    The audit rows are committed first; the rollup upsert runs in its own
+    transaction so a failure there (e.g. sms_logs_daily not migrated yet)
+    does not discard them.
+    """
+    if not rows:
+        return
+    try:
+        SessionLocal, SmsLog = _get_session_and_model()
+        session = SessionLocal()
+        try:
+            session.bulk_insert_mappings(SmsLog, rows)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    except Exception as e:
+        logger.warning("SMS audit log write failed (%d rows): %s", len(rows), e)
+        return
+
+    try:
+        _, _, SmsLogDaily = _get_log_query_deps()
+        session = SessionLocal()
+        try:
+            stmt = mysql_insert(SmsLogDaily).values(_daily_rollup(rows))
+            session.execute(stmt.on_duplicate_key_update(
+                log_count=SmsLogDaily.log_count + stmt.inserted.log_count,
+                sms_count=SmsLogDaily.sms_count + stmt.inserted.sms_count,
+            ))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    except Exception as e:
+        logger.warning("SMS daily rollup update failed (%d rows): %s", len(rows), e)
+
+
+def _log_worker() -> None:
+    """Drain the audit queue, committing up to _LOG_BATCH_SIZE rows at a time. A None item stops the worker."""
+    while True:
+        try:
+            item = _log_queue.get(timeout=1.0)
+        except queue.Empty:
+            continue
+        stop = item is None
+        rows = [] if stop else [item]
+        while not stop and len(rows) < _LOG_BATCH_SIZE:
+            try:
+                item = _log_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                stop = True
+            else:
+                rows.append(item)
+        _write_sms_log_rows(rows)
+        if stop:
+            return
+
+
+def _ensure_log_worker() -> None:
+    global _log_worker_thread
+    if _log_worker_thread is not None and _log_worker_thread.is_alive():
+        return
+    with _log_worker_lock:
+        if _log_worker_thread is None or not _log_worker_thread.is_alive():
+            _log_worker_thread = threading.Thread(target=_log_worker, name="sms-audit-log", daemon=True)
+            _log_worker_thread.start()
+
+
+def _flush_sms_logs(timeout: float = 10.0) -> None:
+    """Stop the audit worker after it has written everything queued so far (registered with atexit)."""
+    thread = _log_worker_thread
+    if thread is None or not thread.is_alive():
+        return
+    try:
+        _log_queue.put(None, timeout=timeout)
+    except queue.Full:
+        logger.warning("SMS audit log queue still full at shutdown; pending rows may be lost")
+        return
+    thread.join(timeout)
+
+
+atexit.register(_flush_sms_logs)
+
+
+def _sms_log_row(
     *,
     sender_id: str,
     recipient: str,
@@ -49,39 +186,75 @@ def _log_sms(
     api_response_raw: Optional[str] = None,
     error_message: Optional[str] = None,
     created_by: Optional[int] = None,
-) -> None:
-    """Write audit log for an SMS. Uses a dedicated session; swallows errors so logging never breaks SMS flow."""
-    try:
-        SessionLocal, SmsLog = _get_session_and_model()
-        session = SessionLocal()
+) -> Dict[str, Any]:
+    """Build an sms_logs row mapping."""
+    return {
+        "sender_id": sender_id,
+        "recipient": recipient,
+        "message": message,
+        "message_length": message_length,
+        "sms_count": _sms_count_from_length(message_length),
+        "process_name": process_name,
+        "status": status,
+        "provider": provider,
+        "external_id": external_id,
+        "api_response_raw": api_response_raw,
+        "error_message": error_message,
+        "created_by": created_by,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def _enqueue_sms_logs(rows: List[Dict[str, Any]]) -> None:
+    """Queue audit rows for the background writer. Never blocks or raises; drops rows if the queue is full."""
+    if not rows:
+        return
+    _ensure_log_worker()
+    for i, row in enumerate(rows):
         try:
-            sms_count = _sms_count_from_length(message_length)
-            row = SmsLog(
-                sender_id=sender_id,
-                recipient=recipient,
-                message=message,
-                message_length=message_length,
-                sms_count=sms_count,
-                process_name=process_name,
-                status=status,
-                provider=provider,
-                external_id=external_id,
-                api_response_raw=api_response_raw,
-                error_message=error_message,
-                created_by=created_by,
-            )
-            session.add(row)
-            session.commit()
-        finally:
-            session.close()
-    except Exception as e:
-        logger.warning("SMS audit log write failed: %s", e)
+            _log_queue.put_nowait(row)
+        except queue.Full:
+            logger.warning("SMS audit log queue full; dropping %d log row(s)", len(rows) - i)
+            return
+
+
+def _log_sms(**fields: Any) -> None:
+    """Queue an audit log row for an SMS. Accepts the same keyword fields as _sms_log_row."""
+    _enqueue_sms_logs([_sms_log_row(**fields)])
 
 # mShastra JSON API endpoint
 MSHASTRA_JSON_URL = os.getenv('MSHASTRA_API_URL', 'https://mshastra.com/sendsms_api_json.aspx')
 DEFAULT_COUNTRY_CODE = '255'
+
+# Shared HTTP session so consecutive SMS posts reuse a keep-alive connection
+# to mShastra. Retry's default allowed_methods excludes POST, so only failed
+# connection attempts are retried and an SMS is never re-submitted.
+_HTTP = requests.Session()
+_HTTP.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False),
+))
 DEFAULT_LANGUAGE = 'English'
 
+# Raw provider responses are kept for failed sends only, unless
+# MSHASTRA_STORE_RAW_ON_SUCCESS is set for debugging; stored bodies are capped.
+STORE_RAW_ON_SUCCESS = os.getenv('MSHASTRA_STORE_RAW_ON_SUCCESS', '').strip().lower() in ('1', 'true', 'yes')
+RAW_RESPONSE_MAX_CHARS = 2048
+
+
+def _truncate(s: Optional[str], n: int = RAW_RESPONSE_MAX_CHARS) -> Optional[str]:
+    if s is None or len(s) <= n:
+        return s
+    return s[:n]
+
+
+def _raw_response(text: Optional[str], ok: bool) -> Optional[str]:
+    """Value to store in sms_logs.api_response_raw for a send with the given outcome."""
+    if ok and not STORE_RAW_ON_SUCCESS:
+        return None
+    return _truncate(text)
+
 # GSM-7 segment size. 1–160 chars → 1 SMS, 161–320 → 2, etc. Used for billing reconciliation.
 SMS_CHARS_PER_SEGMENT = 160
 
@@ -94,6 +267,11 @@ def _sms_count_from_length(message_length: int) -> int:
     return max(1, (n + SMS_CHARS_PER_SEGMENT - 1) // SMS_CHARS_PER_SEGMENT)
 
 
+# Drops every non-digit ASCII character; non-ASCII input falls back to the regex
+_ASCII_NON_DIGITS = str.maketrans('', '', ''.join(chr(c) for c in range(128) if not chr(c).isdigit()))
+_NON_DIGIT_RE = re.compile(r'\D')
+
+
 def _normalize_phone(phone: str, use_last_nine: bool = True) -> str:
     """
     Normalize phone for mShastra (Tanzania).
@@ -102,7 +280,19 @@ def _normalize_phone(phone: str, use_last_nine: bool = True) -> str:
     """
     if not phone or not isinstance(phone, str):
         return ''
-    digits = re.sub(r'\D', '', phone)
+    # Already canonical (the usual case for numbers read back from the DB)
+    if len(phone) == 12 and phone.startswith(DEFAULT_COUNTRY_CODE) and phone.isascii() and phone.isdigit():
+        return phone
+    return _normalize_phone_cached(phone, bool(use_last_nine))
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_phone_cached(phone: str, use_last_nine: bool) -> str:
+    """Strip/prefix work for _normalize_phone, memoized for repeat recipients (e.g. OTP resends)."""
+    if phone.isascii():
+        digits = phone.translate(_ASCII_NON_DIGITS)
+    else:
+        digits = _NON_DIGIT_RE.sub('', phone)
     if not digits:
         return ''
 
@@ -115,12 +305,14 @@ def _normalize_phone(phone: str, use_last_nine: bool = True) -> str:
     return digits
 
 
-def _config() -> Dict[str, str]:
-    cfg = {
+@functools.lru_cache(maxsize=1)
+def _config() -> types.MappingProxyType:
+    """mShastra credentials, read from the environment once per process."""
+    cfg = types.MappingProxyType({
         'user': os.getenv('MSHASTRA_USER', 'AFRICANHUB'),
         'pwd': os.getenv('MSHASTRA_PWD', ''),
         'sender': os.getenv('MSHASTRA_SENDER', 'AFRICANHUB'),
-    }
+    })
     if not cfg['pwd']:
         logger.warning("MSHASTRA_PWD is not set; SMS API may reject requests")
     return cfg
@@ -128,37 +320,70 @@ def _config() -> Dict[str, str]:
 
 def _send_json_payload(payload: List[Dict[str, Any]]) -> Dict[str, Any]:
     """POST JSON array to mShastra JSON API. payload = list of {user, pwd, number, msg, sender, language}."""
-    # Log request with masked password
-    mask = [{**p, 'pwd': '***'} for p in payload]
-    logger.info(
-        "SMS API request: url=%s payload=%s",
-        MSHASTRA_JSON_URL,
-        mask,
-        extra={'sms_payload_masked': mask},
-    )
+    # Log request with masked password (the masked copy is only built if INFO is enabled)
+    if logger.isEnabledFor(logging.INFO):
+        mask = [{**p, 'pwd': '***'} for p in payload]
+        logger.info(
+            "SMS API request: url=%s payload=%s",
+            MSHASTRA_JSON_URL,
+            mask,
+            extra={'sms_payload_masked': mask},
+        )
     try:
-        resp = requests.post(
+        resp = _HTTP.post(
             MSHASTRA_JSON_URL,
             json=payload,
-            headers={'Content-Type': 'application/json'},
-            timeout=30,
+            timeout=(3.05, 30),
         )
+        text = resp.text
+        # Grep-friendly line: "SMS API says: ..."
         logger.info(
-            "SMS API response: status=%s body=%s",
+            "SMS API says: [status=%s] %s",
             resp.status_code,
-            resp.text,
-            extra={'sms_status': resp.status_code, 'sms_response': resp.text},
+            text,
+            extra={'sms_status': resp.status_code, 'sms_response': text},
         )
-        # Grep-friendly line: "SMS API says: ..."
-        logger.info("SMS API says: [status=%s] %s", resp.status_code, resp.text)
-        return {'success': resp.status_code == 200, 'status_code': resp.status_code, 'text': resp.text}
+        return {'success': resp.status_code == 200, 'status_code': resp.status_code, 'text': text}
     except Exception as e:
         logger.exception("SMS API error: %s", e)
         return {'success': False, 'status_code': None, 'text': str(e)}
 
 
+# Large batches are split into chunks and posted in parallel, bounded so we
+# stay within the provider's rate limits. A failed chunk only fails its own
+# recipients.
+MSHASTRA_CHUNK_SIZE = int(os.getenv('MSHASTRA_CHUNK_SIZE', '100'))
+MSHASTRA_MAX_PARALLEL = int(os.getenv('MSHASTRA_MAX_PARALLEL', '5'))
+_chunk_executor = ThreadPoolExecutor(max_workers=MSHASTRA_MAX_PARALLEL, thread_name_prefix="sms-chunk")
+
+
+def _send_json_chunks(payload: List[Dict[str, Any]]) -> List[tuple]:
+    """POST payload in MSHASTRA_CHUNK_SIZE chunks, concurrently. Returns [(chunk, result), ...] in order."""
+    chunks = [payload[i:i + MSHASTRA_CHUNK_SIZE] for i in range(0, len(payload), MSHASTRA_CHUNK_SIZE)]
+    if len(chunks) == 1:
+        return [(chunks[0], _send_json_payload(chunks[0]))]
+    logger.info("SMS send_messages: posting %d recipients in %d chunks", len(payload), len(chunks))
+    return list(zip(chunks, _chunk_executor.map(_send_json_payload, chunks)))
+
+
 def _parse_external_id(response_text: str) -> Optional[str]:
     """Extract msg_id from mShastra JSON response [{"msg_id":"...", ...}]."""
+    if not response_text:
+        return None
+    # Fast path: scan for the quoted msg_id value without parsing the JSON
+    i = response_text.find('"msg_id"')
+    if i < 0:
+        return None
+    j = response_text.find(':', i + 8)
+    if j >= 0:
+        j += 1
+        while j < len(response_text) and response_text[j] in ' \t\r\n':
+            j += 1
+        if j < len(response_text) and response_text[j] == '"':
+            k = response_text.find('"', j + 1)
+            if k > j + 1 and '\\' not in response_text[j + 1:k]:
+                return response_text[j + 1:k]
+    # Unquoted, empty or escaped values go through the JSON parser
     try:
         arr = json.loads(response_text)
         if arr and isinstance(arr[0], dict) and arr[0].get("msg_id"):
@@ -168,6 +393,78 @@ def _parse_external_id(response_text: str) -> Optional[str]:
     return None
 
 
+def _entry_succeeded(entry: Dict[str, Any]) -> bool:
+    """True if a per-recipient mShastra response entry reports success."""
+    return 'success' in (entry.get('str_response') or '').casefold()
+
+
+# Concurrent single sends are coalesced: each caller queues its item, and
+# one caller at a time posts up to SEND_QUEUE_MAX_BATCH queued items as one
+# JSON array (the mShastra API accepts a list), then hands each caller the
+# result for its own item. A caller posts at most one batch per turn and
+# returns once its own item has a result, so no request ends up sending
+# other requests' SMS indefinitely.
+SEND_QUEUE_MAX_BATCH = 100
+_send_queue: "queue.Queue[tuple]" = queue.Queue()
+_send_cond = threading.Condition()
+_send_in_flight = False
+
+
+def _send_queued_batch() -> None:
+    """Post one batch of up to SEND_QUEUE_MAX_BATCH queued single-send items and resolve their futures."""
+    batch = []
+    while len(batch) < SEND_QUEUE_MAX_BATCH:
+        try:
+            batch.append(_send_queue.get_nowait())
+        except queue.Empty:
+            break
+    if not batch:
+        return
+
+    items = [item for item, _ in batch]
+    try:
+        out = _send_json_payload(items)
+    except Exception as e:
+        out = {'success': False, 'status_code': None, 'text': str(e)}
+
+    if len(batch) == 1:
+        batch[0][1].set_result(out)
+        return
+
+    logger.info("SMS send queue: coalesced %d single sends into one request", len(batch))
+    try:
+        resp_arr = json.loads(out['text']) if out['success'] and out.get('text') else []
+    except Exception:
+        resp_arr = []
+    for i, (_, fut) in enumerate(batch):
+        entry = resp_arr[i] if i < len(resp_arr) and isinstance(resp_arr[i], dict) else None
+        if entry is None:
+            fut.set_result(out)
+            continue
+        ok = out['success'] and _entry_succeeded(entry)
+        fut.set_result({'success': ok, 'status_code': out['status_code'], 'text': json.dumps([entry])})
+
+
+def _send_single_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Send one payload item via the coalescing send queue. Returns the same shape as _send_json_payload."""
+    global _send_in_flight
+    fut: Future = Future()
+    _send_queue.put((item, fut))
+    while True:
+        with _send_cond:
+            # Sleep until our item is resolved or no batch is in flight
+            _send_cond.wait_for(lambda: fut.done() or not _send_in_flight)
+            if fut.done():
+                return fut.result()
+            _send_in_flight = True
+        try:
+            _send_queued_batch()
+        finally:
+            with _send_cond:
+                _send_in_flight = False
+                _send_cond.notify_all()
+
+
 class SMSService:
     @staticmethod
     def send_message(
@@ -226,7 +523,7 @@ class SMSService:
             'sender': sender_id,
             'language': DEFAULT_LANGUAGE,
         }
-        out = _send_json_payload([item])
+        out = _send_single_item(item)
 
         if out['success']:
             ext_id = _parse_external_id(out['text'])
@@ -238,7 +535,7 @@ class SMSService:
                 process_name=process_name,
                 status="sent",
                 external_id=ext_id,
-                api_response_raw=out['text'],
+                api_response_raw=_raw_response(out['text'], True),
                 created_by=created_by,
             )
             return {'success': True, 'data': {'response': out['text']}, 'message': 'SMS sent'}
@@ -249,7 +546,7 @@ class SMSService:
             message_length=msg_len,
             process_name=process_name,
             status="failed",
-            api_response_raw=out['text'],
+            api_response_raw=_raw_response(out['text'], False),
             error_message=out['text'],
             created_by=created_by,
         )
@@ -274,74 +571,140 @@ class SMSService:
             created_by: Optional user id for audit.
 
         Returns:
-            {'success': bool, 'data': {...}, 'message': str}
+            {'success': bool, 'data': {...}, 'message': str}. data is present whenever
+            anything was posted: response (provider text), sent, failed,
+            failed_recipients and per-chunk results. 'partial': True means some
+            chunks were sent and others failed; retry only failed_recipients.
         """
         cfg = _config()
         default_sid = default_sender or cfg['sender']
-        payload = []
 
-        for r in recipients:
-            phone = r.get('phone') or r.get('number')
-            msg = r.get('message') or r.get('msg') or ''
-            if not phone or not msg:
-                continue
-            normalized = _normalize_phone(phone, use_last_nine=use_last_nine)
-            if not normalized:
-                _log_sms(
-                    sender_id=default_sid,
-                    recipient=phone or "",
-                    message=msg,
-                    message_length=len(msg),
-                    process_name=process_name,
-                    status="failed",
-                    error_message="Invalid or empty phone number",
-                    created_by=created_by,
-                )
-                continue
-            payload.append({
-                'user': cfg['user'],
-                'pwd': cfg['pwd'],
+        # Pass 1: pull out phone/message and normalize every phone in one go
+        phones = [r.get('phone') or r.get('number') for r in recipients]
+        msgs = [r.get('message') or r.get('msg') or '' for r in recipients]
+        normed = [
+            _normalize_phone(phone, use_last_nine) if phone and msg else None
+            for phone, msg in zip(phones, msgs)
+        ]
+
+        # Pass 2: failed audit rows for unusable numbers, payload items for the rest
+        log_rows = [
+            _sms_log_row(
+                sender_id=default_sid,
+                recipient=phone,
+                message=msg,
+                message_length=len(msg),
+                process_name=process_name,
+                status="failed",
+                error_message="Invalid or empty phone number",
+                created_by=created_by,
+            )
+            for phone, msg, normalized in zip(phones, msgs, normed)
+            if normalized == ''
+        ]
+        user, pwd, lang = cfg['user'], cfg['pwd'], DEFAULT_LANGUAGE
+        payload = [
+            {
+                'user': user,
+                'pwd': pwd,
                 'number': normalized,
                 'msg': msg,
                 'sender': r.get('sender') or default_sid,
-                'language': DEFAULT_LANGUAGE,
-            })
+                'language': lang,
+            }
+            for r, msg, normalized in zip(recipients, msgs, normed)
+            if normalized
+        ]
 
         if not payload:
+            _enqueue_sms_logs(log_rows)
             logger.warning("SMS send_messages: no valid recipients")
             return {'success': False, 'data': None, 'message': 'No valid recipients'}
 
-        logger.info("SMS send_messages: count=%d numbers=%s", len(payload), [p['number'] for p in payload])
-        out = _send_json_payload(payload)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("SMS send_messages: count=%d numbers=%s", len(payload), [p['number'] for p in payload])
+        results = _send_json_chunks(payload)
 
-        try:
-            resp_arr = json.loads(out['text']) if out.get('text') else []
-        except Exception:
-            resp_arr = []
-
-        for i, p in enumerate(payload):
-            rec = p['number']
-            msg = p['msg']
-            sid = p['sender']
-            entry = resp_arr[i] if i < len(resp_arr) and isinstance(resp_arr[i], dict) else {}
-            ok = out['success'] and (entry.get('str_response') or '').lower().find('success') >= 0
-            ext_id = str(entry['msg_id']) if entry.get('msg_id') else None
-            _log_sms(
-                sender_id=sid,
-                recipient=rec,
-                message=msg,
-                message_length=len(msg),
-                process_name=process_name,
-                status="sent" if ok else "failed",
-                external_id=ext_id,
-                api_response_raw=json.dumps(entry) if entry else out.get('text'),
-                error_message=None if ok else (out.get('text') or 'Batch send failed'),
-                created_by=created_by,
-            )
+        sent_count = 0
+        failed_recipients = [phone for phone, normalized in zip(phones, normed) if normalized == '']
+        chunk_reports = []
+        provider_entries = []
+        all_entries_parsed = True
+        for chunk, out in results:
+            try:
+                resp_arr = json.loads(out['text']) if out.get('text') else []
+            except Exception:
+                resp_arr = []
+            if isinstance(resp_arr, list):
+                provider_entries.extend(resp_arr)
+            else:
+                resp_arr = []
+                all_entries_parsed = False
+            chunk_sent = 0
+
+            for i, p in enumerate(chunk):
+                rec = p['number']
+                msg = p['msg']
+                sid = p['sender']
+                entry = resp_arr[i] if i < len(resp_arr) and isinstance(resp_arr[i], dict) else {}
+                ok = out['success'] and _entry_succeeded(entry)
+                if ok:
+                    chunk_sent += 1
+                else:
+                    failed_recipients.append(rec)
+                ext_id = str(entry['msg_id']) if entry.get('msg_id') else None
+                log_rows.append(_sms_log_row(
+                    sender_id=sid,
+                    recipient=rec,
+                    message=msg,
+                    message_length=len(msg),
+                    process_name=process_name,
+                    status="sent" if ok else "failed",
+                    external_id=ext_id,
+                    api_response_raw=(
+                        None if ok and not STORE_RAW_ON_SUCCESS
+                        else _truncate(json.dumps(entry) if entry else out.get('text'))
+                    ),
+                    error_message=None if ok else (out.get('text') or 'Batch send failed'),
+                    created_by=created_by,
+                ))
+            sent_count += chunk_sent
+            chunk_reports.append({
+                'success': out['success'],
+                'sent': chunk_sent,
+                'failed': len(chunk) - chunk_sent,
+                'error': None if out['success'] else out.get('text'),
+            })
+        _enqueue_sms_logs(log_rows)
+
+        # Same shape for any number of chunks: 'response' is the provider's text,
+        # with chunk arrays merged into one array when there are several
+        if len(results) == 1:
+            response_text = results[0][1]['text']
+        elif all_entries_parsed:
+            response_text = json.dumps(provider_entries)
+        else:
+            response_text = "\n".join(out['text'] or '' for _, out in results)
+        data = {
+            'response': response_text,
+            'sent': sent_count,
+            'failed': len(failed_recipients),
+            'failed_recipients': failed_recipients,
+            'chunks': chunk_reports,
+        }
 
-        if out['success']:
-            return {'success': True, 'data': {'response': out['text']}, 'message': 'SMS batch sent'}
-        return {'success': False, 'data': None, 'message': f"SMS batch failed: {out['text']}"}
+        failed_chunks = [out['text'] for _, out in results if not out['success']]
+        if not failed_chunks:
+            return {'success': True, 'data': data, 'message': 'SMS batch sent'}
+        if sent_count:
+            # Other chunks went out; callers should retry only failed_recipients
+            return {
+                'success': False,
+                'partial': True,
+                'data': data,
+                'message': f"SMS batch partially sent: {sent_count} sent, {len(failed_recipients)} failed",
+            }
+        return {'success': False, 'data': data, 'message': f"SMS batch failed: {failed_chunks[0]}"}
 
 
 @sms_bp.route('/api/sms/send', methods=['POST'])
@@ -387,6 +750,9 @@ def send_sms_batch():
     result = SMSService.send_messages(
         recipients, default_sender=sender, process_name='api_send_batch'
     )
+    if result.get('partial'):
+        # Some recipients were sent; a blind retry would send them again
+        return jsonify(result), 207
     if not result['success']:
         return jsonify(result), 400
     return jsonify(result)
@@ -678,6 +1044,14 @@ def _sms_log_to_dict(row) -> Dict[str, Any]:
     }
 
 
+def _json_response(body: Dict[str, Any]) -> Response:
+    """Compact, unsorted, non-ASCII-escaped JSON response for large log payloads."""
+    return Response(
+        json.dumps(body, ensure_ascii=False, separators=(',', ':'), default=str),
+        mimetype='application/json',
+    )
+
+
 def _parse_date(s: str) -> Optional[datetime]:
     """Parse YYYY-MM-DD to datetime. Returns None if empty/invalid."""
     s = (s or "").strip()
@@ -698,15 +1072,15 @@ def get_sms_logs():
       - per_page (default 20)
       - process_name: filter by process (e.g. registration, payment_approved)
       - status: filter by status (sent | failed)
-      - recipient: filter by recipient number (partial match)
+      - recipient: filter by recipient number (prefix match if it starts with 255, else partial match)
       - from_date: filter created_at >= this date (YYYY-MM-DD)
       - to_date: filter created_at <= this date (YYYY-MM-DD)
+      - cursor, cursor_id: keyset pagination. Pass pagination.next_cursor and
+        pagination.next_cursor_id from the previous response to get the next
+        page without an OFFSET scan; when given, page is ignored.
     """
     try:
-        from database.db_connector import get_db
-        from applications.models.models import SmsLog
-        from sqlalchemy import func
-
+        get_db, SmsLog, SmsLogDaily = _get_log_query_deps()
         db = get_db()
         try:
             page = max(1, request.args.get('page', 1, type=int))
@@ -733,13 +1107,32 @@ def get_sms_logs():
                     "message": "from_date must be on or before to_date",
                 }), 400
 
+            cursor_raw = request.args.get('cursor', '').strip()
+            cursor_id = request.args.get('cursor_id', type=int)
+            cursor_dt = None
+            if cursor_raw:
+                try:
+                    cursor_dt = datetime.fromisoformat(cursor_raw)
+                except ValueError:
+                    cursor_dt = None
+                if cursor_dt is None or cursor_id is None:
+                    return jsonify({
+                        "status": "error",
+                        "message": "cursor must be an ISO datetime and cursor_id an integer",
+                    }), 400
+
             def _apply_filters(q):
                 if process_name:
                     q = q.filter(SmsLog.process_name == process_name)
                 if status:
                     q = q.filter(SmsLog.status == status)
                 if recipient:
-                    q = q.filter(SmsLog.recipient.contains(recipient))
+                    # Full numbers (255...) are prefix-matched so ix_sms_logs_recipient
+                    # can be used; partial numbers still match anywhere
+                    if recipient.startswith(DEFAULT_COUNTRY_CODE):
+                        q = q.filter(SmsLog.recipient.startswith(recipient))
+                    else:
+                        q = q.filter(SmsLog.recipient.contains(recipient))
                 if from_date is not None:
                     q = q.filter(SmsLog.created_at >= from_date)
                 if to_date is not None:
@@ -747,23 +1140,45 @@ def get_sms_logs():
                     q = q.filter(SmsLog.created_at <= end_of_day)
                 return q
 
-            q = _apply_filters(db.query(SmsLog))
-            total_count = q.count()
-            total_sms_count = _apply_filters(
-                db.query(func.coalesce(func.sum(SmsLog.sms_count), 0))
-            ).scalar() or 0
-            total_sms_count = int(total_sms_count)
-
-            offset = (page - 1) * per_page
-            rows = (
-                _apply_filters(db.query(SmsLog))
-                .order_by(SmsLog.created_at.desc())
-                .offset(offset)
-                .limit(per_page)
-                .all()
+            if recipient:
+                q = _apply_filters(db.query(SmsLog))
+                total_count = q.count()
+                total_sms_count = _apply_filters(
+                    db.query(func.coalesce(func.sum(SmsLog.sms_count), 0))
+                ).scalar() or 0
+            else:
+                # Date filters cover whole days, so totals come from the daily rollup
+                dq = db.query(
+                    func.coalesce(func.sum(SmsLogDaily.log_count), 0),
+                    func.coalesce(func.sum(SmsLogDaily.sms_count), 0),
+                )
+                if process_name:
+                    dq = dq.filter(SmsLogDaily.process_name == process_name)
+                if status:
+                    dq = dq.filter(SmsLogDaily.status == status)
+                if from_date is not None:
+                    dq = dq.filter(SmsLogDaily.day >= from_date.date())
+                if to_date is not None:
+                    dq = dq.filter(SmsLogDaily.day <= to_date.date())
+                total_count, total_sms_count = dq.one()
+            total_count = int(total_count)
+            total_sms_count = int(total_sms_count or 0)
+
+            rows_q = _apply_filters(db.query(SmsLog)).order_by(
+                SmsLog.created_at.desc(), SmsLog.id.desc()
             )
+            if cursor_dt is not None:
+                rows_q = rows_q.filter(tuple_(SmsLog.created_at, SmsLog.id) < (cursor_dt, cursor_id))
+            else:
+                rows_q = rows_q.offset((page - 1) * per_page)
+            rows = rows_q.limit(per_page).all()
 
-            return jsonify({
+            next_cursor = next_cursor_id = None
+            if len(rows) == per_page:
+                next_cursor = rows[-1].created_at.isoformat()
+                next_cursor_id = rows[-1].id
+
+            return _json_response({
                 "status": "success",
                 "message": "SMS logs retrieved successfully",
                 "data": {
@@ -774,6 +1189,8 @@ def get_sms_logs():
                         "page": page,
                         "per_page": per_page,
                         "total_pages": (total_count + per_page - 1) // per_page,
+                        "next_cursor": next_cursor,
+                        "next_cursor_id": next_cursor_id,
                     },
                 },
             })
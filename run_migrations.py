@@ -14,24 +14,22 @@ def run_migrations():
     
     migrations_dir = "migrations"
     
-    # Get all Python files in the migrations directory
-    migration_files = [f for f in os.listdir(migrations_dir) 
-                      if f.endswith('.py') and f != '__init__.py']
-    
-    # Sort migration files to ensure consistent order
-    migration_files.sort()
+    # Get all Python files in the migrations directory, sorted by name for a consistent order
+    with os.scandir(migrations_dir) as entries:
+        migration_files = sorted(
+            (e for e in entries if e.name.endswith('.py') and e.name != '__init__.py' and e.is_file()),
+            key=lambda e: e.name,
+        )
     
     # Get database connection
     connection = db.get_engine().connect()
     
-    for migration_file in migration_files:
+    for entry in migration_files:
+        migration_file = entry.name
         try:
-            # Get the full path of the migration file
-            file_path = os.path.join(migrations_dir, migration_file)
-            
             # Load the migration module
             spec = importlib.util.spec_from_file_location(
-                migration_file[:-3], file_path)
+                migration_file[:-3], entry.path)
             module = importlib.util.module_from_spec(spec)
             spec.loader.exec_module(module)
             
@@ -10,40 +10,37 @@ Uses .env in project root for MSHASTRA_*. No venv required; needs 'requests'.
 import os
 import re
 import sys
+from pathlib import Path
 
 # Project root (parent of scripts/)
-ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-os.chdir(ROOT)
-sys.path.insert(0, ROOT)
+ROOT = Path(__file__).resolve().parent.parent
+
+_ENV_LINE = re.compile(r"^\s*(?:export\s+)?([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.*?)\s*$")
+
 
 # Load .env manually (no python-dotenv required)
 def _load_env():
-    path = os.path.join(ROOT, ".env")
-    path = os.path.abspath(path)
+    path = ROOT / ".env"
     print(f"Loading .env from: {path}")
-    if not os.path.isfile(path):
+    if not path.is_file():
         print("  -> Not found. Create .env in project root with MSHASTRA_USER, MSHASTRA_PWD, MSHASTRA_SENDER.")
         return
-    loaded = []
     with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if line.startswith("export "):
-                line = line[7:].strip()
-            if "=" not in line:
-                continue
-            k, v = line.split("=", 1)
-            k, v = k.strip(), v.strip()
-            if v.startswith('"') and v.endswith('"') or (v.startswith("'") and v.endswith("'")):
-                v = v[1:-1]
-            os.environ[k] = v
-            if k.startswith("MSHASTRA_"):
-                loaded.append(k)
+        text = f.read()
+    loaded = []
+    for line in text.splitlines():
+        m = _ENV_LINE.match(line)  # comments and blank lines never match
+        if not m:
+            continue
+        k, v = m.group(1), m.group(2)
+        if len(v) >= 2 and v[0] == v[-1] and v[0] in "\"'":
+            v = v[1:-1]
+        os.environ[k] = v
+        if k.startswith("MSHASTRA_"):
+            loaded.append(k)
     print(f"  -> Loaded. MSHASTRA_* keys: {', '.join(loaded) or '(none)'}")
 
-_load_env()
+_NON_DIGIT = re.compile(r"\D")
 
 DEFAULT_PHONE = "255717098911"
 DEFAULT_MSG = "Test SMS from AfricanHub API. If you receive this, mShastra is working."
@@ -76,7 +73,7 @@ def main():
         print("ERROR: MSHASTRA_PWD is not set. Add it to .env and try again.")
         sys.exit(1)
 
-    digits = re.sub(r"\D", "", phone)
+    digits = phone if phone.isascii() and phone.isdigit() else _NON_DIGIT.sub("", phone)
     if len(digits) >= 9:
         normalized = "255" + digits[-9:]
     else:
@@ -123,4 +120,8 @@ def main():
 
 
 if __name__ == "__main__":
+    # Only touch cwd/sys.path/env when run as a script, not when imported
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+    _load_env()
     main()
@@ -1,25 +1,25 @@
 from functools import wraps
 from flask import request, jsonify
+from werkzeug.exceptions import Unauthorized
 from .jwt_handler import JWTHandler
 
 def jwt_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = None
-        if 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
-            try:
-                token = auth_header.split(" ")[1]
-            except IndexError:
-                return jsonify({"message": "Invalid token format"}), 401
+        auth_header = request.headers.get('Authorization')
+        if auth_header is None:
+            return jsonify({"message": "Token is missing"}), 401
+        if not auth_header.startswith('Bearer '):
+            return jsonify({"message": "Invalid token format"}), 401
 
+        token = auth_header[7:].strip()
         if not token:
             return jsonify({"message": "Token is missing"}), 401
 
         try:
             current_user = JWTHandler.get_current_user(token)
-            return f(current_user, *args, **kwargs)
-        except Exception as e:
+        except Unauthorized:
             return jsonify({"message": "Invalid token"}), 401
+        return f(current_user, *args, **kwargs)
 
-    return decorated 
\ No newline at end of file
+    return decorated
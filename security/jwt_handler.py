@@ -1,23 +1,61 @@
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
+from typing import Dict, Optional, Tuple
+import jwt
+from jwt import InvalidTokenError
 from passlib.context import CryptContext
 from werkzeug.exceptions import Unauthorized
+import logging
 import os
 import secrets
+import threading
+import time
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # JWT Configuration
-SECRET_KEY = os.environ.get('JWT_SECRET_KEY', secrets.token_hex(32))  # Use the same secret key as Flask-JWT-Extended
+SECRET_KEY = os.environ.get('JWT_SECRET_KEY')  # Use the same secret key as Flask-JWT-Extended
+if not SECRET_KEY:
+    # Random per-process fallback, shared with app.py through the environment.
+    # Tokens will not validate across workers or restarts.
+    logger.warning("JWT_SECRET_KEY is not set; using a random per-process key")
+    SECRET_KEY = os.environ['JWT_SECRET_KEY'] = secrets.token_hex(32)
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 # Password hashing configuration
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Decoded tokens are cached until they expire, so repeat requests with the
+# same token skip the signature check and JSON parse (FIFO, bounded).
+TOKEN_CACHE_MAX = 1024
+_token_cache: Dict[str, Tuple[float, dict]] = {}
+_token_cache_order: deque = deque()
+_token_cache_lock = threading.Lock()
+
+
+def _decode_token(token: str) -> dict:
+    """jwt.decode with a per-token cache. Raises InvalidTokenError like jwt.decode."""
+    with _token_cache_lock:
+        hit = _token_cache.get(token)
+    if hit is not None and hit[0] > time.time():
+        return dict(hit[1])
+    # python-jose accepted non-string "sub" claims; keep accepting them
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], options={"verify_sub": False})
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        with _token_cache_lock:
+            if token not in _token_cache:
+                _token_cache_order.append(token)
+                while len(_token_cache_order) > TOKEN_CACHE_MAX:
+                    _token_cache.pop(_token_cache_order.popleft(), None)
+            _token_cache[token] = (float(exp), payload)
+    return dict(payload)
+
 class JWTHandler:
     @staticmethod
     def get_password_hash(password: str) -> str:
@@ -46,18 +84,17 @@ class JWTHandler:
     def verify_token(token: str) -> dict:
         """Verify a JWT token"""
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            payload = _decode_token(token)
             if payload.get("exp") < datetime.utcnow().timestamp():
                 raise Unauthorized("Token has expired")
             return payload
-        except JWTError:
+        except InvalidTokenError:
             raise Unauthorized("Could not validate credentials")
 
     @staticmethod
     def get_current_user(token: str) -> dict:
         """Get the current user from a JWT token"""
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            return payload
-        except JWTError:
+            return _decode_token(token)
+        except InvalidTokenError:
             raise Unauthorized("Invalid token") 
\ No newline at end of file
@@ -3,42 +3,39 @@ VdoCipher Service for video DRM integration
 Handles video upload, OTP generation, and video management
 """
 
+import functools
+import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
 import json
-import time
 from typing import Dict, Optional
-from functools import wraps
 
+logger = logging.getLogger(__name__)
 
-def retry_on_failure(max_retries=3, delay=2):
+
+def _retry_policy() -> Retry:
     """
-    Decorator to retry failed API calls with exponential backoff
-    
-    Args:
-        max_retries: Maximum number of retry attempts
-        delay: Initial delay between retries in seconds
+    Exponential backoff with jitter for transient VdoCipher failures.
+    Connection errors are retried for every method; 429/5xx responses only for
+    GET/DELETE/POST (OTP). PUT creates a video, so it is not re-sent on a 5xx.
+    Read timeouts are never retried: the request may already have been
+    processed, and each retry would hold the worker for another full timeout.
     """
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            last_exception = None
-            
-            for attempt in range(max_retries):
-                try:
-                    return func(*args, **kwargs)
-                except requests.exceptions.RequestException as e:
-                    last_exception = e
-                    if attempt < max_retries - 1:
-                        wait_time = delay * (attempt + 1)  # Exponential backoff
-                        print(f"Attempt {attempt + 1} failed: {str(e)}. Retrying in {wait_time}s...")
-                        time.sleep(wait_time)
-                    else:
-                        print(f"All {max_retries} attempts failed")
-            
-            raise last_exception
-        return wrapper
-    return decorator
+    kwargs = dict(
+        total=3,
+        read=0,
+        backoff_factor=1,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'DELETE', 'POST']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    try:
+        return Retry(backoff_jitter=0.3, **kwargs)
+    except TypeError:  # urllib3 < 2 has no backoff_jitter
+        return Retry(**kwargs)
 
 
 class VdoCipherService:
@@ -57,8 +54,12 @@ class VdoCipherService:
             'Authorization': f'Apisecret {self.api_secret}',
             'Content-Type': 'application/json'
         }
+
+        # Keep-alive session with the auth headers attached once
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=16, max_retries=_retry_policy()))
     
-    @retry_on_failure(max_retries=3, delay=2)
     def get_video_details(self, video_id: str) -> Dict:
         """
         Get video details including status, duration, thumbnails
@@ -75,7 +76,7 @@ class VdoCipherService:
         url = f"{self.BASE_URL}/videos/{video_id}"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = self.session.get(url, timeout=30)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.Timeout:
@@ -88,7 +89,6 @@ class VdoCipherService:
             else:
                 raise Exception(f"VdoCipher API error: {e.response.text}")
     
-    @retry_on_failure(max_retries=3, delay=2)
     def generate_otp(self, video_id: str, user_id: int, user_email: str, 
                      user_name: str, ip_address: str = None) -> Dict:
         """
@@ -128,7 +128,7 @@ class VdoCipherService:
             payload["ip"] = ip_address
         
         try:
-            response = requests.post(url, json=payload, headers=self.headers, timeout=30)
+            response = self.session.post(url, json=payload, timeout=30)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.Timeout:
@@ -143,7 +143,6 @@ class VdoCipherService:
             else:
                 raise Exception(f"Failed to generate OTP: {e.response.text}")
     
-    @retry_on_failure(max_retries=3, delay=2)
     def upload_video(self, title: str, folder_id: Optional[str] = None) -> Dict:
         """
         Get upload credentials for a new video
@@ -169,12 +168,11 @@ class VdoCipherService:
             params["folderId"] = folder_id
         
         try:
-            response = requests.put(url, params=params, headers=self.headers, timeout=30)
+            response = self.session.put(url, params=params, timeout=30)
             response.raise_for_status()
             response_data = response.json()
             
-            # Log response for debugging
-            print(f"VdoCipher upload response: {response_data}")
+            logger.debug("VdoCipher upload response: %s", response_data)
             
             return response_data
         except requests.exceptions.Timeout:
@@ -187,7 +185,6 @@ class VdoCipherService:
             else:
                 raise Exception(f"VdoCipher API error: {e.response.text}")
     
-    @retry_on_failure(max_retries=3, delay=2)
     def delete_video(self, video_id: str) -> bool:
         """
         Delete video from VdoCipher
@@ -208,13 +205,11 @@ class VdoCipherService:
         url = f"{self.BASE_URL}/videos/{video_id}"
         
         try:
-            response = requests.delete(url, headers=self.headers, timeout=30)
+            response = self.session.delete(url, timeout=30)
             response.raise_for_status()
             
-            # Log response for debugging
-            print(f"VdoCipher delete response status: {response.status_code}")
-            if response.text:
-                print(f"VdoCipher delete response: {response.text}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("VdoCipher delete response: status=%s body=%s", response.status_code, response.text)
             
             return True
         except requests.exceptions.HTTPError as e:
@@ -233,14 +228,18 @@ class VdoCipherService:
         """
         try:
             url = f"{self.BASE_URL}/videos"
-            response = requests.get(
+            response = self.session.get(
                 url,
-                headers=self.headers,
                 params={'limit': 1},
                 timeout=5
             )
             return response.status_code == 200
         except Exception as e:
-            print(f"VdoCipher connection test failed: {str(e)}")
+            logger.warning("VdoCipher connection test failed: %s", e)
             return False
 
+
+@functools.lru_cache(maxsize=1)
+def get_vdocipher() -> VdoCipherService:
+    """Process-wide VdoCipherService. Raises ValueError (not cached) if VDOCIPHER_API_SECRET is unset."""
+    return VdoCipherService()
@@ -1,17 +1,69 @@
 import os
+import sys
 import logging
-from typing import Optional, Dict, Any
-from b2sdk.v2 import *
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, Any, List, Tuple, BinaryIO
+from b2sdk.v2 import B2Api, SqliteAccountInfo, AuthInfoCache, UploadSourceStream, b2_url_encode
+from b2sdk.v2.exception import FileNotPresent, MissingAccountData
+from b2sdk.b2http import NotDecompressingHTTPAdapter
 import tempfile
-import shutil
+import threading
+import heapq
+import itertools
+import warnings
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
+# Extension -> MIME type for uploads without an explicit content type
+CONTENT_TYPES = MappingProxyType({
+    '.mp4': 'video/mp4',
+    '.webm': 'video/webm',
+    '.avi': 'video/x-msvideo',
+    '.mov': 'video/quicktime',
+    '.wmv': 'video/x-ms-wmv',
+    '.mkv': 'video/x-matroska',
+    '.m3u8': 'application/vnd.apple.mpegurl',
+    '.ts': 'video/MP2T',
+    '.pdf': 'application/pdf',
+    '.doc': 'application/msword',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.txt': 'text/plain',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.wav': 'audio/wav'
+})
+
+# Keep-alive connections per host in b2sdk's shared requests.Session. The
+# requests default of 10 is below b2sdk's upload workers plus bulk_upload
+# threads, so surplus connections were closed and re-handshaked after each call.
+B2_HTTP_POOL_SIZE = int(os.getenv('B2_HTTP_POOL_SIZE', '32'))
+
+# Write buffer for download_file. Large buffers mean one write(2) per MiB
+# instead of one per 8 KiB for video-sized files.
+B2_DOWNLOAD_BUFFER_SIZE = 1024 * 1024
+
+# Auth token, API/download URLs and bucket ids are persisted here so new
+# worker processes skip authorize_account and the bucket lookup. b2sdk
+# creates the file with 0600 permissions; expired tokens are renewed
+# automatically from the stored key.
+B2_ACCOUNT_INFO_CACHE = os.getenv(
+    'B2_ACCOUNT_INFO_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'africanhub', 'b2_account_info.sqlite'),
+)
+
 class B2StorageService:
+    __slots__ = (
+        'api', 'bucket', 'bucket_name', 'application_key_id', 'application_key',
+        '_download_url_prefix',
+    )
+    
     def __init__(self):
         self.api = None
         self.bucket = None
+        self._download_url_prefix = None
         self.bucket_name = os.getenv('B2_BUCKET_NAME')
         self.application_key_id = os.getenv('B2_APPLICATION_KEY_ID')
         self.application_key = os.getenv('B2_APPLICATION_KEY')
@@ -24,21 +76,53 @@ class B2StorageService:
     def _initialize_b2(self):
         """Initialize B2 API and get bucket reference"""
         try:
-            # Create B2 API instance
-            self.api = B2Api()
+            # Create B2 API instance backed by the persistent account info cache
+            os.makedirs(os.path.dirname(B2_ACCOUNT_INFO_CACHE), mode=0o700, exist_ok=True)
+            account_info = SqliteAccountInfo(file_name=B2_ACCOUNT_INFO_CACHE)
+            self.api = B2Api(
+                account_info,
+                cache=AuthInfoCache(account_info),
+                save_to_buffer_size=B2_DOWNLOAD_BUFFER_SIZE
+            )
+            self._configure_http_pool()
             
-            # Authenticate with B2
-            self.api.authorize_account("production", self.application_key_id, self.application_key)
-            logger.info("Successfully authenticated with B2")
+            # Authenticate with B2 unless a token for this key is already cached
+            if self._has_cached_authorization(account_info):
+                logger.info("Using cached B2 authorization")
+            else:
+                self.api.authorize_account("production", self.application_key_id, self.application_key)
+                logger.info("Successfully authenticated with B2")
             
-            # Get bucket reference
+            # Get bucket reference (bucket id is served from the cache after the first lookup)
             self.bucket = self.api.get_bucket_by_name(self.bucket_name)
             logger.info(f"Successfully connected to B2 bucket: {self.bucket_name}")
             
+            # The download host comes with the authorization and only changes with
+            # the account's cluster, so file URLs are built from a fixed prefix
+            self._download_url_prefix = f"{account_info.get_download_url()}/file/{self.bucket_name}/"
+            
         except Exception as e:
             logger.error(f"Failed to initialize B2: {str(e)}")
             raise
     
+    def _configure_http_pool(self):
+        """Give b2sdk's HTTP session a connection pool sized for concurrent uploads"""
+        # b2sdk mounts its own NotDecompressingHTTPAdapter; replace it with a larger one.
+        # Retries stay with b2sdk, which already retries B2 errors with backoff.
+        session = self.api.session.raw_api.b2_http.session
+        session.mount('', NotDecompressingHTTPAdapter(
+            pool_connections=B2_HTTP_POOL_SIZE,
+            pool_maxsize=B2_HTTP_POOL_SIZE
+        ))
+    
+    def _has_cached_authorization(self, account_info) -> bool:
+        """True if the account info cache holds a token issued for this application key."""
+        try:
+            account_info.get_account_auth_token()
+            return account_info.get_application_key_id() == self.application_key_id
+        except MissingAccountData:
+            return False
+    
     def upload_file(self, local_file_path: str, b2_file_path: str, content_type: Optional[str] = None) -> Dict[str, Any]:
         """
         Upload a file to B2
@@ -119,6 +203,100 @@ class B2StorageService:
             logger.error(f"Failed to upload data to B2: {str(e)}")
             raise
     
+    def upload_from_stream(self, stream: BinaryIO, b2_file_path: str, content_type: Optional[str] = None,
+                           stream_length: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Upload from a binary file object without materializing it in memory or on disk
+        
+        Args:
+            stream: Readable binary stream (e.g. an uploaded FileStorage.stream)
+            b2_file_path: Desired path in B2 bucket
+            content_type: MIME type of the file
+            stream_length: Size in bytes if known; seekable streams are measured otherwise
+            
+        Returns:
+            Dict containing file info
+        """
+        try:
+            if not content_type:
+                content_type = self._get_content_type_from_path(b2_file_path)
+            
+            if stream_length is None and stream.seekable():
+                start = stream.tell()
+                stream_length = stream.seek(0, os.SEEK_END) - start
+                stream.seek(start)
+            
+            if stream_length is None:
+                # Unknown length: b2sdk buffers part-sized chunks as it reads
+                uploaded_file = self.bucket.upload_unbound_stream(
+                    stream, b2_file_path, content_type=content_type
+                )
+            else:
+                start = stream.tell() if stream.seekable() else 0
+                
+                def open_stream():
+                    # b2sdk reopens the source on retry; rewind instead
+                    if stream.seekable():
+                        stream.seek(start)
+                    return stream
+                
+                uploaded_file = self.bucket.upload(
+                    UploadSourceStream(open_stream, stream_length=stream_length),
+                    b2_file_path,
+                    content_type=content_type
+                )
+            
+            logger.info(f"Successfully uploaded stream to B2 as {b2_file_path}")
+            
+            return {
+                'file_id': uploaded_file.id_,
+                'file_name': uploaded_file.file_name,
+                'content_length': uploaded_file.size,
+                'content_sha1': uploaded_file.content_sha1,
+                'content_type': uploaded_file.content_type,
+                'upload_timestamp': uploaded_file.upload_timestamp,
+                'b2_file_path': b2_file_path
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to upload stream to B2: {str(e)}")
+            raise
+    
+    def bulk_upload(self, items: List[Tuple[bytes, str, Optional[str]]], max_concurrency: int = 10) -> List[Dict[str, Any]]:
+        """
+        Upload several files concurrently
+        
+        Uploads are network-bound, so they run on a thread pool. Payloads above
+        b2sdk's part size are split into parts and uploaded in parallel by b2sdk.
+        
+        Args:
+            items: List of (file_data, b2_file_path, content_type) tuples
+            max_concurrency: Maximum number of uploads in flight
+            
+        Returns:
+            List of per-item status dicts in input order; failed items carry the error
+            instead of raising, so callers can retry only what failed
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        if not items:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(items)))) as executor:
+            futures = {
+                executor.submit(self.upload_file_data, file_data, b2_file_path, content_type): (index, b2_file_path)
+                for index, (file_data, b2_file_path, content_type) in enumerate(items)
+            }
+            for future in as_completed(futures):
+                index, b2_file_path = futures[future]
+                try:
+                    results[index] = {'success': True, 'b2_file_path': b2_file_path, 'file_info': future.result()}
+                except Exception as e:
+                    results[index] = {'success': False, 'b2_file_path': b2_file_path, 'error': str(e)}
+        
+        failed = sum(1 for result in results if not result['success'])
+        logger.info(f"Bulk upload finished: {len(items) - failed}/{len(items)} succeeded")
+        return results
+    
     def get_file_url(self, b2_file_path: str) -> str:
         """
         Get the public URL for a file in B2
@@ -130,13 +308,9 @@ class B2StorageService:
             Public URL for the file
         """
         try:
-            # Get file info
-            file_info = self.bucket.get_file_info_by_name(b2_file_path)
-            
-            # Generate download URL
-            download_url = self.api.get_download_url_for_file_name(self.bucket_name, b2_file_path)
-            
-            return download_url
+            # Built locally from the cached prefix; no file-info request or
+            # account-info lookup needed
+            return self._download_url_prefix + b2_url_encode(b2_file_path)
             
         except Exception as e:
             logger.error(f"Failed to get URL for {b2_file_path}: {str(e)}")
@@ -154,8 +328,9 @@ class B2StorageService:
             True if successful, False otherwise
         """
         try:
-            # Download file from B2
-            self.bucket.download_file_by_name(b2_file_path, local_file_path)
+            # Download file from B2 straight into the local file. The second
+            # positional parameter is a progress listener, not a destination.
+            self.bucket.download_file_by_name(b2_file_path).save_to(local_file_path)
             logger.info(f"Successfully downloaded {b2_file_path} to {local_file_path}")
             return True
             
@@ -218,62 +393,103 @@ class B2StorageService:
         """
         try:
             files = []
-            all_files = list(self.bucket.ls())
-            
-            # Filter by prefix if provided
-            if prefix:
-                all_files = [f for f in all_files if f.file_name.startswith(prefix)]
-            
-            # Limit to max_count
-            limited_files = all_files[:max_count]
-            
-            for file_info in limited_files:
-                files.append({
-                    'file_name': file_info.file_name,
-                    'content_length': file_info.content_length,
-                    'upload_timestamp': file_info.upload_timestamp,
-                    'content_type': file_info.content_type
-                })
+            if max_count <= 0:
+                return files
+            
+            # Push the folder part of the prefix down to B2 so only that part of the
+            # bucket is listed, then stop as soon as max_count matches are found.
+            # Only fields already present in the list response are read.
+            folder = prefix[:prefix.rfind('/') + 1]
+            for file_info, _ in self.bucket.ls(
+                folder_to_list=folder,
+                latest_only=True,
+                recursive=True,
+                # Pages only need to cover max_count unless names are filtered locally too
+                fetch_count=min(max_count, 1000) if folder == prefix else 1000,
+            ):
+                if prefix and not file_info.file_name.startswith(prefix):
+                    continue
+                files.append(self._file_entry(file_info))
+                if len(files) >= max_count:
+                    break
             return files
             
         except Exception as e:
             logger.error(f"Failed to list files with prefix {prefix}: {str(e)}")
             return []
     
-    def _get_content_type(self, file_path: str) -> str:
-        """Get content type based on file extension"""
-        return self._get_content_type_from_path(file_path)
-    
-    def _get_content_type_from_path(self, file_path: str) -> str:
-        """Get content type based on file path/name"""
-        ext = os.path.splitext(file_path.lower())[1]
+    def list_files_parallel(self, prefix: str = "", max_count: Optional[int] = None, shards: int = 16) -> list:
+        """
+        List files under a prefix by listing its sub-folders concurrently
         
-        content_types = {
-            '.mp4': 'video/mp4',
-            '.webm': 'video/webm',
-            '.avi': 'video/x-msvideo',
-            '.mov': 'video/quicktime',
-            '.wmv': 'video/x-ms-wmv',
-            '.mkv': 'video/x-matroska',
-            '.m3u8': 'application/vnd.apple.mpegurl',
-            '.ts': 'video/MP2T',
-            '.pdf': 'application/pdf',
-            '.doc': 'application/msword',
-            '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            '.txt': 'text/plain',
-            '.png': 'image/png',
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.gif': 'image/gif',
-            '.wav': 'audio/wav'
-        }
+        Meant for sweeps over large parts of the bucket. The sub-folders directly
+        below the prefix's folder (e.g. one per material) are listed in parallel
+        and merged back into name order.
         
-        return content_types.get(ext, 'application/octet-stream')
+        Args:
+            prefix: File name prefix to filter by
+            max_count: Maximum number of files to return (None for all)
+            shards: Maximum number of sub-folders listed at once
+            
+        Returns:
+            List of file info dictionaries sorted by file name
+        """
+        try:
+            folder = prefix[:prefix.rfind('/') + 1]
+            direct_files = []
+            sub_folders = []
+            # Non-recursive listing returns each sub-folder once instead of its files
+            for file_info, sub_folder in self.bucket.ls(folder_to_list=folder, latest_only=True):
+                if sub_folder is not None:
+                    if sub_folder.startswith(prefix):
+                        sub_folders.append(sub_folder)
+                elif file_info.file_name.startswith(prefix):
+                    direct_files.append(self._file_entry(file_info))
+            
+            if not sub_folders:
+                return direct_files[:max_count]
+            
+            # Each shard only needs max_count entries for the merged result
+            shard_limit = max_count if max_count is not None else sys.maxsize
+            with ThreadPoolExecutor(max_workers=max(1, min(shards, len(sub_folders)))) as executor:
+                shard_results = list(executor.map(
+                    lambda sub_folder: self.list_files(sub_folder, shard_limit),
+                    sub_folders
+                ))
+            
+            files = heapq.merge(direct_files, *shard_results, key=lambda entry: entry['file_name'])
+            return list(itertools.islice(files, max_count))
+            
+        except Exception as e:
+            logger.error(f"Failed to list files with prefix {prefix}: {str(e)}")
+            return []
+    
+    def _file_entry(self, file_info) -> Dict[str, Any]:
+        """File info dict from a listing entry (only fields present in the list response)"""
+        return {
+            'file_name': file_info.file_name,
+            'content_length': file_info.size,
+            'upload_timestamp': file_info.upload_timestamp,
+            'content_type': file_info.content_type
+        }
+    
+    def _get_content_type(self, file_path: str) -> str:
+        """Get content type based on file path/name"""
+        dot, _, ext = file_path.rpartition('.')
+        if not dot or dot[-1] == '/' or '/' in ext:
+            return 'application/octet-stream'
+        return CONTENT_TYPES.get('.' + ext.lower(), 'application/octet-stream')
+    
+    _get_content_type_from_path = _get_content_type
     
     def create_temp_file(self, file_data: bytes, suffix: str = None) -> str:
         """
         Create a temporary file for processing
         
+        Deprecated for uploads: pass bytes to upload_file_data or a file object to
+        upload_from_stream instead. Only needed when an external tool (e.g. ffmpeg)
+        must read the data from a path.
+        
         Args:
             file_data: File data as bytes
             suffix: File extension suffix
@@ -281,6 +497,11 @@ class B2StorageService:
         Returns:
             Path to temporary file
         """
+        warnings.warn(
+            "create_temp_file is deprecated for uploads; use upload_file_data or upload_from_stream",
+            DeprecationWarning,
+            stacklevel=2
+        )
         try:
             # Create temporary file
             temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
@@ -309,10 +530,14 @@ class B2StorageService:
 
 # Global B2 storage service instance
 b2_storage = None
+_b2_storage_lock = threading.Lock()
 
 def get_b2_storage() -> B2StorageService:
     """Get or create B2 storage service instance"""
     global b2_storage
     if b2_storage is None:
-        b2_storage = B2StorageService()
+        with _b2_storage_lock:
+            # Another thread may have finished initializing while we waited
+            if b2_storage is None:
+                b2_storage = B2StorageService()
     return b2_storage
@@ -1,45 +1,147 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
+from pydantic import TypeAdapter
 from studies.models.models import StudyMaterialCategory
 from studies.models.schemas import StudyMaterialCategoryCreate, StudyMaterialCategoryUpdate, StudyMaterialCategoryInDB
 from database.db_connector import db_session
-from datetime import datetime
+from collections import OrderedDict
+import threading
+import time
 
 material_categories_bp = Blueprint('material_categories', __name__)
 
+# Validators built once at import instead of per request
+_create_adapter = TypeAdapter(StudyMaterialCategoryCreate)
+_update_adapter = TypeAdapter(StudyMaterialCategoryUpdate)
+
+# Columns returned by the category endpoints
+_CATEGORY_COLUMNS = (
+    StudyMaterialCategory.id,
+    StudyMaterialCategory.name,
+    StudyMaterialCategory.code,
+    StudyMaterialCategory.description,
+    StudyMaterialCategory.is_protected,
+    StudyMaterialCategory.created_at,
+    StudyMaterialCategory.updated_at,
+)
+
+# Per-process cache of GET /study-materials/categories/<id> response bodies.
+# Updates and deletes evict the entry in the worker that handled them; other
+# workers serve their copy until it expires.
+CATEGORY_CACHE_TTL = 60
+CATEGORY_CACHE_MAX = 1024
+_category_cache: "OrderedDict[int, tuple]" = OrderedDict()
+_category_cache_lock = threading.Lock()
+
+def _cached_category_body(category_id):
+    with _category_cache_lock:
+        hit = _category_cache.get(category_id)
+        if hit is None:
+            return None
+        if hit[0] <= time.monotonic():
+            del _category_cache[category_id]
+            return None
+        _category_cache.move_to_end(category_id)
+        return hit[1]
+
+def _cache_category_body(category_id, body):
+    with _category_cache_lock:
+        _category_cache[category_id] = (time.monotonic() + CATEGORY_CACHE_TTL, body)
+        _category_cache.move_to_end(category_id)
+        while len(_category_cache) > CATEGORY_CACHE_MAX:
+            _category_cache.popitem(last=False)
+
+def _evict_category(category_id):
+    with _category_cache_lock:
+        _category_cache.pop(category_id, None)
+
+def _current_user_id():
+    # jwt_required has already verified and decoded the token once for this
+    # request; get_jwt_identity only reads the stored claims.
+    return int(get_jwt_identity())
+
+def _serialize(category):
+    """Response dict for a category (ORM instance or a row of _CATEGORY_COLUMNS)"""
+    created_at = category.created_at
+    updated_at = category.updated_at
+    return {
+        "id": category.id,
+        "name": category.name,
+        "code": category.code,
+        "description": category.description,
+        "is_protected": category.is_protected,
+        "created_at": created_at.isoformat() if created_at else None,
+        "updated_at": updated_at.isoformat() if updated_at else None
+    }
+
 @material_categories_bp.route('/study-materials/categories', methods=['GET'])
 @jwt_required()
 def get_material_categories():
+    """
+    List live categories ordered by id.
+
+    Query params:
+      - page, per_page: offset pagination (default). The response carries the total.
+      - cursor: keyset pagination. Pass next_cursor from the previous response to
+        get the next page; cost no longer grows with page depth. The total is only
+        computed when include_total=1.
+    """
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
+        cursor = request.args.get('cursor', type=int)
         skip = (page - 1) * per_page
 
-        # Get total count
-        total = db_session.query(StudyMaterialCategory).filter(StudyMaterialCategory.deleted_at.is_(None)).count()
-        
-        # Get paginated categories
-        categories = db_session.query(StudyMaterialCategory).filter(
+        if cursor is not None:
+            # Keyset: WHERE id > cursor ORDER BY id, one extra row tells us if more exist
+            stmt = select(*_CATEGORY_COLUMNS).where(
+                StudyMaterialCategory.deleted_at.is_(None),
+                StudyMaterialCategory.id > cursor
+            ).order_by(StudyMaterialCategory.id).limit(per_page + 1)
+            rows = db_session.execute(stmt).all()
+            has_more = len(rows) > per_page
+            rows = rows[:per_page]
+
+            response = {
+                "items": [_serialize(row) for row in rows],
+                "per_page": per_page,
+                "next_cursor": rows[-1].id if has_more else None
+            }
+            if request.args.get('include_total', type=int):
+                response["total"] = db_session.query(StudyMaterialCategory).filter(
+                    StudyMaterialCategory.deleted_at.is_(None)
+                ).count()
+            return jsonify(response)
+
+        # Rows and the filtered total in one round trip (COUNT(*) OVER ()).
+        # Plain column rows skip ORM instance construction and identity-map work.
+        stmt = select(
+            *_CATEGORY_COLUMNS,
+            func.count().over().label('total')
+        ).where(
             StudyMaterialCategory.deleted_at.is_(None)
-        ).offset(skip).limit(per_page).all()
+        ).order_by(StudyMaterialCategory.id).offset(skip).limit(per_page)
+        rows = db_session.execute(stmt).all()
+
+        if rows:
+            total = rows[0].total
+        elif skip:
+            # Past the last page: no row carries the total, count separately
+            total = db_session.query(StudyMaterialCategory).filter(StudyMaterialCategory.deleted_at.is_(None)).count()
+        else:
+            total = 0
 
         return jsonify({
-            "items": [{
-                "id": category.id,
-                "name": category.name,
-                "code": category.code,
-                "description": category.description,
-                "is_protected": category.is_protected,
-                "created_at": category.created_at.isoformat() if category.created_at else None,
-                "updated_at": category.updated_at.isoformat() if category.updated_at else None
-            } for category in categories],
+            "items": [_serialize(row) for row in rows],
             "total": total,
             "page": page,
             "per_page": per_page,
-            "pages": (total + per_page - 1) // per_page
+            "pages": (total + per_page - 1) // per_page,
+            "next_cursor": rows[-1].id if rows and skip + len(rows) < total else None
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -48,28 +150,20 @@ def get_material_categories():
 @jwt_required()
 def create_material_category():
     try:
-        current_user_id = get_jwt_identity()
+        current_user_id = _current_user_id()
         data = request.get_json()
         
         # Add the created_by and updated_by fields
-        data['created_by'] = int(current_user_id)
-        data['updated_by'] = int(current_user_id)
+        data['created_by'] = current_user_id
+        data['updated_by'] = current_user_id
         
-        category_data = StudyMaterialCategoryCreate(**data)
-        db_category = StudyMaterialCategory(**category_data.dict())
+        category_data = _create_adapter.validate_python(data)
+        db_category = StudyMaterialCategory(**category_data.model_dump())
         db_session.add(db_category)
         db_session.commit()
         db_session.refresh(db_category)
         
-        return jsonify({
-            "id": db_category.id,
-            "name": db_category.name,
-            "code": db_category.code,
-            "description": db_category.description,
-            "is_protected": db_category.is_protected,
-            "created_at": db_category.created_at.isoformat() if db_category.created_at else None,
-            "updated_at": db_category.updated_at.isoformat() if db_category.updated_at else None
-        }), 201
+        return jsonify(_serialize(db_category)), 201
     except Exception as e:
         db_session.rollback()
         return jsonify({"error": str(e)}), 400
@@ -78,23 +172,21 @@ def create_material_category():
 @jwt_required()
 def get_material_category(category_id):
     try:
-        category = db_session.query(StudyMaterialCategory).filter(
-            StudyMaterialCategory.id == category_id,
-            StudyMaterialCategory.deleted_at.is_(None)
-        ).first()
-        
-        if not category:
-            return jsonify({"error": "Category not found"}), 404
+        body = _cached_category_body(category_id)
+        if body is None:
+            category = db_session.query(StudyMaterialCategory).filter(
+                StudyMaterialCategory.id == category_id,
+                StudyMaterialCategory.deleted_at.is_(None)
+            ).first()
             
-        return jsonify({
-            "id": category.id,
-            "name": category.name,
-            "code": category.code,
-            "description": category.description,
-            "is_protected": category.is_protected,
-            "created_at": category.created_at.isoformat() if category.created_at else None,
-            "updated_at": category.updated_at.isoformat() if category.updated_at else None
-        })
+            if not category:
+                return jsonify({"error": "Category not found"}), 404
+            
+            # Cache the encoded body so hits skip serialization too
+            body = f"{current_app.json.dumps(_serialize(category))}\n"
+            _cache_category_body(category_id, body)
+            
+        return current_app.response_class(body, mimetype=current_app.json.mimetype)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -102,34 +194,31 @@ def get_material_category(category_id):
 @jwt_required()
 def update_material_category(category_id):
     try:
-        current_user_id = get_jwt_identity()
+        current_user_id = _current_user_id()
         data = request.get_json()
-        data['updated_by'] = int(current_user_id)
+        data['updated_by'] = current_user_id
         
-        category_data = StudyMaterialCategoryUpdate(**data)
-        category = db_session.query(StudyMaterialCategory).filter(
-            StudyMaterialCategory.id == category_id,
-            StudyMaterialCategory.deleted_at.is_(None)
-        ).first()
+        category_data = _update_adapter.validate_python(data)
         
-        if not category:
+        # The UPDATE doubles as the existence check (MySQL has no UPDATE ... RETURNING)
+        result = db_session.execute(
+            update(StudyMaterialCategory).where(
+                StudyMaterialCategory.id == category_id,
+                StudyMaterialCategory.deleted_at.is_(None)
+            ).values(**category_data.model_dump(exclude_unset=True))
+        )
+        
+        if result.rowcount == 0:
+            db_session.rollback()
             return jsonify({"error": "Category not found"}), 404
             
-        for field, value in category_data.dict(exclude_unset=True).items():
-            setattr(category, field, value)
-            
         db_session.commit()
-        db_session.refresh(category)
+        _evict_category(category_id)
         
-        return jsonify({
-            "id": category.id,
-            "name": category.name,
-            "code": category.code,
-            "description": category.description,
-            "is_protected": category.is_protected,
-            "created_at": category.created_at.isoformat() if category.created_at else None,
-            "updated_at": category.updated_at.isoformat() if category.updated_at else None
-        })
+        # One SELECT for the server-maintained updated_at
+        category = db_session.get(StudyMaterialCategory, category_id)
+        
+        return jsonify(_serialize(category))
     except Exception as e:
         db_session.rollback()
         return jsonify({"error": str(e)}), 400
@@ -138,19 +227,22 @@ def update_material_category(category_id):
 @jwt_required()
 def delete_material_category(category_id):
     try:
-        current_user_id = get_jwt_identity()
-        category = db_session.query(StudyMaterialCategory).filter(
-            StudyMaterialCategory.id == category_id,
-            StudyMaterialCategory.deleted_at.is_(None)
-        ).first()
+        current_user_id = _current_user_id()
+        
+        # Soft delete; the UPDATE doubles as the existence check
+        result = db_session.execute(
+            update(StudyMaterialCategory).where(
+                StudyMaterialCategory.id == category_id,
+                StudyMaterialCategory.deleted_at.is_(None)
+            ).values(deleted_at=func.now(), updated_by=current_user_id)
+        )
         
-        if not category:
+        if result.rowcount == 0:
+            db_session.rollback()
             return jsonify({"error": "Category not found"}), 404
             
-        # Soft delete
-        category.deleted_at = datetime.utcnow()
-        category.updated_by = current_user_id
         db_session.commit()
+        _evict_category(category_id)
         
         return jsonify({"message": "Category deleted successfully"})
     except Exception as e:
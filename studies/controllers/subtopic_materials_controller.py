@@ -10,6 +10,7 @@ from auth.services.device_fingerprint_service import DeviceFingerprintService
 from datetime import datetime, timedelta
 import os
 import re
+import functools
 import glob
 import json
 import struct
@@ -37,6 +38,14 @@ subtopic_materials_bp = Blueprint('subtopic_materials', __name__)
 HLS_FOLDER = os.path.join(UPLOAD_FOLDER, 'hls')
 os.makedirs(HLS_FOLDER, exist_ok=True)
 
+# Numeric index of an HLS segment file name (segment_000.ts -> 0)
+_SEGMENT_RE = re.compile(r'segment_(\d+)\.ts')
+
+def _segment_index(filename: str) -> int:
+    """Sort key for segment file names; names without an index sort first."""
+    match = _SEGMENT_RE.search(filename)
+    return int(match.group(1)) if match else 0
+
 def is_hls_ready(manifest_path: str) -> bool:
     """Return True if manifest exists and at least one .ts segment exists next to it."""
     try:
@@ -48,14 +57,26 @@ def is_hls_ready(manifest_path: str) -> bool:
             else:
                 abs_manifest = os.path.join(UPLOAD_FOLDER, abs_manifest)
 
-        if not os.path.exists(abs_manifest):
+        # The manifest and directory mtimes key the cached answer: rewriting the
+        # manifest or adding/removing segments invalidates it
+        try:
+            manifest_mtime = os.stat(abs_manifest).st_mtime_ns
+            dir_mtime = os.stat(os.path.dirname(abs_manifest)).st_mtime_ns
+        except OSError:
             return False
 
+        return _is_hls_ready_cached(abs_manifest, manifest_mtime, dir_mtime)
+    except Exception:
+        return False
+
+@functools.lru_cache(maxsize=4096)
+def _is_hls_ready_cached(abs_manifest: str, manifest_mtime: int, dir_mtime: int) -> bool:
+    try:
         hls_dir = os.path.dirname(abs_manifest)
-        # Must have at least one .ts file
-        ts_candidates = glob.glob(os.path.join(hls_dir, '*.ts'))
-        if not ts_candidates:
-            return False
+        # Must have at least one .ts file; stop at the first one
+        with os.scandir(hls_dir) as entries:
+            if not any(e.name.endswith('.ts') and not e.name.startswith('.') for e in entries):
+                return False
 
         # Basic manifest sanity: non-empty and references at least one .ts line
         try:
@@ -90,22 +111,18 @@ def repair_incomplete_manifest(manifest_path: str) -> str:
         if not os.path.exists(manifest_dir):
             return manifest_path
             
-        # Find all segment files
-        segment_files = []
-        for file in os.listdir(manifest_dir):
-            if file.endswith('.ts') and file.startswith('segment_'):
-                segment_files.append(file)
-        
-        if not segment_files:
+        # Find all segment files, sorted naturally by their index
+        with os.scandir(manifest_dir) as entries:
+            indexed = [
+                (_segment_index(e.name), e.name) for e in entries
+                if e.name.startswith('segment_') and e.name.endswith('.ts')
+            ]
+        
+        if not indexed:
             return manifest_path
             
-        # Sort segments naturally
-        def natural_sort_key(filename):
-            import re
-            match = re.search(r'segment_(\d+)\.ts', filename)
-            return int(match.group(1)) if match else 0
-            
-        segment_files.sort(key=natural_sort_key)
+        indexed.sort()
+        segment_files = [name for _, name in indexed]
         
         # Read existing manifest to get headers and duration info
         with open(manifest_path, 'r') as f:
@@ -119,8 +136,8 @@ def repair_incomplete_manifest(manifest_path: str) -> str:
         i = 0
         while i < len(lines):
             line = lines[i]
-            if line.strip() and not line.startswith('#') and '.' in line:
-                # This is a segment line, start collecting segment entries
+            if line.startswith('#EXTINF') or (line.strip() and not line.startswith('#') and '.' in line):
+                # First segment entry (its EXTINF or the segment line itself)
                 break
             headers.append(line)
             i += 1
@@ -137,30 +154,37 @@ def repair_incomplete_manifest(manifest_path: str) -> str:
             else:
                 i += 1
         
-        # Create new manifest with all segments
-        new_content = '\n'.join(headers) + '\n'
+        # Known durations by segment file name; the first entry for a name wins
+        durations = {}
+        for dur_line, seg_line in segment_entries:
+            segment_name = seg_line.strip().rsplit('/', 1)[-1]
+            if segment_name in durations:
+                continue
+            try:
+                durations[segment_name] = float(dur_line.split(',')[0].split(':')[1])
+            except (IndexError, ValueError):
+                pass
+        
+        # Create new manifest with all segments; pieces are joined once at the end
+        header_content = '\n'.join(headers) + '\n'
         
         # Add VOD type if missing
-        if '#EXT-X-PLAYLIST-TYPE:VOD' not in new_content:
-            new_content = new_content.replace('#EXTM3U', '#EXTM3U\n#EXT-X-PLAYLIST-TYPE:VOD')
+        if '#EXT-X-PLAYLIST-TYPE:VOD' not in header_content:
+            header_content = header_content.replace('#EXTM3U', '#EXTM3U\n#EXT-X-PLAYLIST-TYPE:VOD')
+        parts = [header_content]
         
         # Add all segments with their durations
         for segment_file in segment_files:
-            # Try to find duration from existing entries
-            duration = 8.333333  # Default duration
-            for dur_line, seg_line in segment_entries:
-                if segment_file in seg_line:
-                    duration = float(dur_line.split(',')[0].split(':')[1])
-                    break
-            
-            new_content += f'#EXTINF:{duration},\n{segment_file}\n'
+            # Duration from the existing entries, or the default
+            duration = durations.get(segment_file, 8.333333)
+            parts.append(f'#EXTINF:{duration},\n{segment_file}\n')
         
         # Add ENDLIST
-        new_content += '#EXT-X-ENDLIST\n'
+        parts.append('#EXT-X-ENDLIST\n')
         
         # Write repaired manifest
         with open(manifest_path, 'w') as f:
-            f.write(new_content)
+            f.write(''.join(parts))
             
         print(f"Repaired manifest: {manifest_path}")
         return manifest_path
@@ -217,17 +241,7 @@ def normalize_vod_manifest(lines: List[str]) -> List[str]:
         output.append(line)
 
     # Sort segments by filename (natural sort for segment_000.ts, segment_001.ts, etc.)
-    def natural_sort_key(item):
-        if len(item) == 3:
-            duration, duration_line, segment = item
-            # Extract numeric part from segment filename for sorting
-            import re
-            match = re.search(r'segment_(\d+)\.ts', segment)
-            if match:
-                return int(match.group(1))
-        return 0
-
-    segments_with_duration.sort(key=natural_sort_key)
+    segments_with_duration.sort(key=lambda item: _segment_index(item[2]) if len(item) == 3 else 0)
 
     # Rebuild manifest with sorted segments
     for item in segments_with_duration:
@@ -944,8 +958,8 @@ def delete_material(material_id):
         # Delete VdoCipher video if this is a DRM-protected video
         if material.vdocipher_video_id and material.requires_drm:
             try:
-                from services.vdocipher_service import VdoCipherService
-                vdocipher = VdoCipherService()
+                from services.vdocipher_service import get_vdocipher
+                vdocipher = get_vdocipher()
                 vdocipher.delete_video(material.vdocipher_video_id)
                 logger.info(f"✅ Deleted VdoCipher video {material.vdocipher_video_id} for material {material_id}")
             except Exception as vdo_err:
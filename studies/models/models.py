@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, BigInteger, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, BigInteger, ForeignKey, Float, Index
 from sqlalchemy.sql import func
 from database.db_connector import Base
 from datetime import datetime
 
 class StudyMaterialCategory(Base):
     __tablename__ = 'study_material_categories'
+    __table_args__ = (
+        # Listing index for /study-materials/categories (live rows ordered by id)
+        Index("ix_study_material_categories_deleted_id", "deleted_at", "id"),
+    )
 
     id = Column(BigInteger, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
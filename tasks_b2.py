@@ -124,10 +124,8 @@ def update_material_path(material_id, new_path):
 def upload_file_to_b2(b2_storage_service, local_path, b2_path, content_type, file_index, total_files):
     """Upload a single file to B2 with progress tracking"""
     try:
-        with open(local_path, 'rb') as f:
-            file_data = f.read()
-        
-        b2_storage_service.upload_file_data(file_data, b2_path, content_type)
+        # Streamed from disk by b2sdk; the file is never held in memory whole
+        b2_storage_service.upload_file(local_path, b2_path, content_type)
         logger.info(f"Uploaded file {file_index + 1}/{total_files} to B2: {b2_path}")
         return True
     except Exception as e:
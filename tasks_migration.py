@@ -115,10 +115,8 @@ def get_materials_for_migration():
 def upload_file_to_b2(b2_storage_service, local_path, b2_path, content_type, file_index, total_files):
     """Upload a single file to B2 with progress tracking"""
     try:
-        with open(local_path, 'rb') as f:
-            file_data = f.read()
-        
-        b2_storage_service.upload_file_data(file_data, b2_path, content_type)
+        # Streamed from disk by b2sdk; the file is never held in memory whole
+        b2_storage_service.upload_file(local_path, b2_path, content_type)
         logger.info(f"Uploaded file {file_index + 1}/{total_files} to B2: {b2_path}")
         return True
     except Exception as e:
@@ -185,11 +183,8 @@ def migrate_material_to_b2(material_id, local_path):
         manifest_b2_path = f"{b2_base_path}/output.m3u8"
         
         logger.info(f"Uploading manifest: {manifest_b2_path}")
-        with open(manifest_local_abs, 'rb') as f:
-            manifest_data = f.read()
-        
-        b2_storage_service.upload_file_data(
-            manifest_data, 
+        b2_storage_service.upload_file(
+            manifest_local_abs, 
             manifest_b2_path, 
             'application/vnd.apple.mpegurl'
         )
@@ -210,11 +205,8 @@ def migrate_material_to_b2(material_id, local_path):
             segment_b2_path = f"{b2_base_path}/{segment_file}"
             
             try:
-                with open(segment_local, 'rb') as f:
-                    segment_data = f.read()
-                
-                b2_storage_service.upload_file_data(
-                    segment_data, 
+                b2_storage_service.upload_file(
+                    segment_local, 
                     segment_b2_path, 
                     'video/MP2T'
                 )
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Smoke test for the self-registration blueprint.
+
+Imports public.controllers.self_registration_controller without a MySQL
+server (the database module is replaced by an in-memory stand-in), registers
+the blueprint and posts one registration with the DB session and
+SMSService.send_message mocked.
+
+Run: python -m pytest -q test_self_registration.py
+"""
+
+import os
+import sys
+import types
+import unittest
+from unittest import mock
+
+from flask import Flask
+from flask_jwt_extended import JWTManager
+from sqlalchemy.orm import declarative_base
+
+
+def _stub_database():
+    """Replace database/__init__ and db_connector, which connect to MySQL on import"""
+    if 'public.controllers.self_registration_controller' in sys.modules:
+        return
+    db_connector = types.ModuleType('database.db_connector')
+    db_connector.Base = declarative_base()
+    db_connector.db_session = mock.MagicMock(name='db_session')
+    db_connector.engine = mock.MagicMock(name='engine')
+    db_connector.init_db = lambda: None
+    db_connector.get_db = mock.MagicMock(name='get_db')
+    db_connector.DBConnector = mock.MagicMock(name='DBConnector')
+    database = types.ModuleType('database')
+    # Submodules other than db_connector (e.g. database.base) load from disk
+    database.__path__ = [os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database')]
+    database.db_connector = db_connector
+    sys.modules['database'] = database
+    sys.modules['database.db_connector'] = db_connector
+
+
+_stub_database()
+from public.controllers import self_registration_controller as registration  # noqa: E402
+
+# Models that User's relationships refer to by name, as app.py imports them
+import applications.models.models  # noqa: E402,F401
+import chat.models.models  # noqa: E402,F401
+import instructors.models.models  # noqa: E402,F401
+import studies.models.models  # noqa: E402,F401
+import subjects.models.models  # noqa: E402,F401
+import testimonials.models.models  # noqa: E402,F401
+
+
+class _RunInline:
+    """Executor stand-in that runs submitted work immediately"""
+
+    def submit(self, fn, *args, **kwargs):
+        fn(*args, **kwargs)
+
+
+class SelfRegistrationSmokeTest(unittest.TestCase):
+    def setUp(self):
+        app = Flask(__name__)
+        app.config['JWT_SECRET_KEY'] = 'test-secret-key-with-enough-length'
+        JWTManager(app)
+        app.register_blueprint(registration.public)
+        self.client = app.test_client()
+
+    def test_blueprint_registers_route(self):
+        rules = {rule.rule for rule in self.client.application.url_map.iter_rules()}
+        self.assertIn('/api/self-registration', rules)
+
+    def test_registration_sends_welcome_sms(self):
+        session = mock.MagicMock(name='db_session')
+
+        def assign_id():
+            user = session.add.call_args_list[0].args[0]
+            user.id = 42
+
+        session.flush.side_effect = assign_id
+
+        with mock.patch.object(registration, 'db_session', session), \
+                mock.patch.object(registration, 'get_student_role_id', return_value=3), \
+                mock.patch.object(registration, '_sms_executor', _RunInline()), \
+                mock.patch.object(registration.SMSService, 'send_message',
+                                  return_value={'success': True}) as send_message:
+            response = self.client.post('/api/self-registration', json={
+                'first_name': 'Asha',
+                'last_name': 'Juma',
+                'phone': '0755344162',
+                'email': 'asha@example.com',
+            })
+
+        self.assertEqual(response.status_code, 201, response.get_json())
+        body = response.get_json()
+        self.assertEqual(body['data']['user']['id'], 42)
+        self.assertEqual(body['data']['user']['phone'], '255755344162')
+        session.commit.assert_called_once()
+        send_message.assert_called_once()
+        self.assertEqual(send_message.call_args.kwargs['phone'], '255755344162')
+        self.assertEqual(send_message.call_args.kwargs['process_name'], 'registration')
+
+
+if __name__ == '__main__':
+    unittest.main()